@@ -0,0 +1,81 @@
+import os
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def is_parquet(path):
+    return os.path.splitext(str(path))[1].lower() in PARQUET_EXTENSIONS
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Reading or writing Parquet files requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def iter_table_chunks(path, chunksize=100_000, columns=None, dtype=None):
+    """
+    Yield DataFrames of at most `chunksize` rows from a CSV or Parquet file, so only one chunk
+    is ever held in memory. `columns` restricts the columns read; `dtype` is passed to the CSV
+    parser (Parquet files carry their own types).
+    """
+    if is_parquet(path):
+        pyarrow = _import_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        from pandas import read_csv
+        with read_csv(path, chunksize=chunksize, usecols=columns, dtype=dtype) as reader:
+            for chunk in reader:
+                yield chunk
+
+
+class TableChunkWriter:
+    def __init__(self, path):
+        """
+        Append DataFrame chunks to a Parquet file (one row group per chunk) or to a CSV file.
+        Use as a context manager, or call close() when done.
+        """
+        self.path = path
+        self.rows_written = 0
+        self._parquet = is_parquet(path)
+        self._writer = None
+        self._schema = None
+        self._file = None
+
+    def write(self, df):
+        if self._parquet:
+            pyarrow = _import_pyarrow()
+            table = pyarrow.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema)
+            else:
+                # A chunk whose column happens to be all-null would otherwise infer a different type
+                table = table.cast(self._schema)
+            self._writer.write_table(table)
+        else:
+            if self._file is None:
+                self._file = open(self.path, "w", newline="")
+                df.to_csv(self._file, index=False)
+            else:
+                df.to_csv(self._file, index=False, header=False)
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,199 @@
+import numpy as np
+from chunked_io import is_parquet, iter_table_chunks
+
+FREQUENCIES = ("D", "W", "M")
+UNIT = {"D": "datetime64[D]", "W": "datetime64[D]", "M": "datetime64[M]"}
+
+
+def _period_numbers(timestamps, frequency):
+    # Absolute period numbers: days since 1970-01-01, Monday-based weeks, or months since 1970-01
+    numbers = np.asarray(timestamps).astype(UNIT[frequency]).astype(np.int64)
+    if frequency == "W":
+        numbers = (numbers + 3) // 7  # 1970-01-01 was a Thursday
+    return numbers
+
+
+def _period_starts(numbers, frequency):
+    if frequency == "W":
+        return (numbers * 7 - 3).astype("datetime64[D]")
+    return numbers.astype(UNIT[frequency])
+
+
+class DemandBucketer:
+    # A chunk whose SKU x period bounding box exceeds this many cells per transaction is added
+    # with np.add.at instead of a bincount over the box
+    MAX_BOX_PER_ROW = 16
+
+    def __init__(self, frequency="W", dtype=np.float64):
+        """
+        Aggregate order-line transactions (timestamp, SKU, quantity) into daily ("D"), weekly
+        ("W", Monday-based) or monthly ("M") demand per SKU. Transactions can arrive in any order
+        and in any number of chunks: SKU ids are coded to integers as they are first seen, and
+        quantities are accumulated into a dense SKU x period matrix with bincount/add.at, never
+        by sorting.
+        """
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"frequency must be one of {', '.join(FREQUENCIES)}")
+        self.frequency = frequency
+        self.sku_ids = []
+        self._codes = {}
+        self._totals = np.zeros((0, 0), dtype=dtype)
+        self._origin = None  # absolute period number of column 0
+        self._rows = 0
+        self._first = None
+        self._last = None
+        self.transactions = 0
+
+    def _encode(self, skus):
+        from pandas import factorize, isna
+        # SKU ids are always strings, so "0042" from one source and 42 from another cannot
+        # become two SKUs (or mix types in sku_ids)
+        skus = np.asarray(skus)
+        if skus.dtype.kind != "U":
+            if isna(skus).any():
+                raise ValueError("Transactions must all have a SKU id")
+            skus = skus.astype(str)
+        local_codes, uniques = factorize(skus)
+        if (local_codes < 0).any():
+            raise ValueError("Transactions must all have a SKU id")
+        uniques = uniques.tolist()
+        codes = self._codes
+        for sku in uniques:
+            if sku not in codes:
+                codes[sku] = len(self.sku_ids)
+                self.sku_ids.append(sku)
+        mapping = np.fromiter((codes[sku] for sku in uniques), dtype=np.int64, count=len(uniques))
+        return mapping[local_codes]
+
+    def _reserve(self, rows, first, last):
+        # Grow the accumulator geometrically (in SKUs, and in periods on either side) so growth
+        # stays amortised O(1) per cell however the transactions are ordered
+        capacity_rows, capacity_periods = self._totals.shape
+        if self._origin is None:
+            origin, end = first, last + 1
+        else:
+            origin, end = self._origin, self._origin + capacity_periods
+            if rows <= capacity_rows and first >= origin and last < end:
+                return
+            if first < origin:
+                origin = min(first, origin - capacity_periods)
+            if last >= end:
+                end = max(last + 1, end + capacity_periods)
+            rows = max(rows, 2 * capacity_rows) if rows > capacity_rows else capacity_rows
+        grown = np.zeros((rows, end - origin), dtype=self._totals.dtype)
+        if self._origin is not None:
+            offset = self._origin - origin
+            grown[:capacity_rows, offset:offset + capacity_periods] = self._totals
+        self._totals = grown
+        self._origin = origin
+
+    def add(self, timestamps, skus, quantities):
+        """Accumulate one chunk of transactions given as equal-length arrays."""
+        quantities = np.asarray(quantities, dtype=self._totals.dtype)
+        if not len(quantities):
+            return
+        codes = self._encode(skus)
+        periods = _period_numbers(timestamps, self.frequency)
+        first, last = int(periods.min()), int(periods.max())
+        self._rows = len(self.sku_ids)
+        self._reserve(self._rows, first, last)
+        self._first = first if self._first is None else min(self._first, first)
+        self._last = last if self._last is None else max(self._last, last)
+        self.transactions += len(quantities)
+
+        columns = periods - self._origin
+        low_code, high_code = int(codes.min()), int(codes.max())
+        low_column, high_column = int(columns.min()), int(columns.max())
+        box_rows, box_columns = high_code - low_code + 1, high_column - low_column + 1
+        if box_rows * box_columns <= self.MAX_BOX_PER_ROW * len(quantities):
+            # Typical for time-ordered logs: a chunk covers a few periods, so a dense bincount
+            # over its bounding box is cheapest
+            flat = (codes - low_code) * box_columns + (columns - low_column)
+            box = np.bincount(flat, weights=quantities, minlength=box_rows * box_columns)
+            self._totals[low_code:high_code + 1, low_column:high_column + 1] += box.reshape(box_rows, box_columns)
+        else:
+            np.add.at(self._totals, (codes, columns), quantities)
+
+    def ingest(self, path, chunksize=1_000_000, timestamp="timestamp", sku="sku", quantity="qty"):
+        """Stream a CSV or Parquet transaction log through add(), one chunk at a time."""
+        from pandas import to_datetime
+        # Read as text: left to infer, pandas can type the same SKU column differently per chunk
+        dtype = None if is_parquet(path) else {sku: str}
+        for chunk in iter_table_chunks(path, chunksize=chunksize, columns=[timestamp, sku, quantity], dtype=dtype):
+            self.add(to_datetime(chunk[timestamp]).to_numpy(), chunk[sku].to_numpy(), chunk[quantity].to_numpy())
+        return self
+
+    @property
+    def period_starts(self):
+        """Start date of every period from the first to the last one with transactions."""
+        if self._first is None:
+            return np.array([], dtype=UNIT[self.frequency])
+        return _period_starts(np.arange(self._first, self._last + 1), self.frequency)
+
+    @property
+    def demand(self):
+        """SKUs x periods demand, rows in the order of sku_ids (a view of the accumulator)."""
+        if self._first is None:
+            return self._totals[:0, :0]
+        return self._totals[:self._rows, self._first - self._origin:self._last - self._origin + 1]
+
+    def days_per_period(self):
+        starts = self.period_starts
+        if self.frequency == "D":
+            return np.ones(len(starts))
+        if self.frequency == "W":
+            return np.full(len(starts), 7.0)
+        return ((starts + 1).astype("datetime64[D]") - starts.astype("datetime64[D]")).astype(float)
+
+    def statistics(self):
+        """
+        Per-SKU demand_rate (mean units per day) and standard_deviation_per_day, the
+        EOQCalculator inputs, as a dict of arrays alongside sku_ids. Periods without
+        transactions count as zero demand. With weekly or monthly buckets the daily standard
+        deviation is the spread of the per-period daily rates scaled by sqrt(days per period),
+        i.e. assuming independent days.
+        """
+        demand = self.demand
+        days = self.days_per_period()
+        daily_rates = demand / days
+        rate = demand.sum(axis=1) / days.sum() if len(days) else np.zeros(len(demand))
+        if len(days) > 1:
+            deviation = daily_rates.std(axis=1, ddof=1) * np.sqrt(days.mean())
+        else:
+            deviation = np.full(len(demand), np.nan)
+        return {"sku_ids": np.asarray(self.sku_ids), "demand_rate": rate, "standard_deviation_per_day": deviation}
+
+    def to_store(self, path, dtype="float32"):
+        """Write the bucketed demand to a new DemandStore, one period at a time."""
+        from demand_store import DemandStore
+        store = DemandStore.create(path, self.sku_ids, dtype=dtype)
+        labels = self.period_starts.astype(str)
+        demand = self.demand
+        for start in range(0, demand.shape[1], 64):
+            store.append_periods(demand[:, start:start + 64], labels=labels[start:start + 64])
+        return store
+
+
+def main():
+    import os
+    import tempfile
+    from pandas import DataFrame
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.mkdtemp(), "transactions.csv")
+    start = np.datetime64("2023-01-01T00:00")
+    for part in range(5):
+        lines = 1_000_000
+        DataFrame({
+            "timestamp": start + rng.integers(0, 2 * 365 * 24 * 60, lines).astype("timedelta64[m]"),
+            "sku": rng.integers(0, 50_000, lines).astype(str),
+            "qty": rng.integers(1, 10, lines),
+        }).to_csv(path, mode="a", header=part == 0, index=False)
+
+    bucketer = DemandBucketer("W").ingest(path, chunksize=500_000)
+    stats = bucketer.statistics()
+    print(f"{bucketer.transactions} transactions -> {len(bucketer.sku_ids)} SKUs x {len(bucketer.period_starts)} weeks")
+    print(f"SKU {stats['sku_ids'][0]}: {stats['demand_rate'][0]:.2f} units/day, "
+          f"sigma {stats['standard_deviation_per_day'][0]:.2f} per day")
+
+if __name__ == "__main__":
+    main()
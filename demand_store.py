@@ -0,0 +1,141 @@
+import json
+import os
+import numpy as np
+from time_series_forecast import TimeSeriesForecast
+
+META_FILE = "meta.json"
+DATA_FILE = "demand.bin"
+SKU_FILE = "skus.npy"
+
+
+class DemandStore:
+    def __init__(self, path):
+        """
+        Open a demand-history store created with DemandStore.create. The history is one raw
+        binary file laid out period by period (all SKUs of period 0, then all SKUs of period 1,
+        ...), so appending a period only appends to the file, and `matrix` is a zero-copy
+        SKUs x periods view of it through a read-only memory map.
+        """
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.dtype = np.dtype(meta["dtype"])
+        self.n_periods = meta["n_periods"]
+        self.period_labels = meta["periods"]
+        self.sku_ids = np.load(os.path.join(path, SKU_FILE), allow_pickle=False)
+        self.n_skus = len(self.sku_ids)
+        self._sku_order = None
+        self._map()
+
+    @classmethod
+    def create(cls, path, sku_ids, dtype="float32"):
+        """
+        Create an empty store for the given SKU ids (strings or integers, one row each, in this
+        order). float32 keeps 2M SKUs x 260 weeks at about 2 GB on disk.
+        """
+        os.makedirs(path, exist_ok=True)
+        sku_ids = np.asarray(sku_ids)
+        if sku_ids.dtype == object:
+            sku_ids = sku_ids.astype(str)
+        if len(np.unique(sku_ids)) != len(sku_ids):
+            raise ValueError("SKU ids must be unique")
+        np.save(os.path.join(path, SKU_FILE), sku_ids, allow_pickle=False)
+        open(os.path.join(path, DATA_FILE), "wb").close()
+        cls._write_meta(path, np.dtype(dtype).str, 0, [])
+        return cls(path)
+
+    @staticmethod
+    def _write_meta(path, dtype, n_periods, periods):
+        # Written to a temporary file and renamed, so the metadata is never half written
+        temporary = os.path.join(path, META_FILE + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump({"dtype": dtype, "n_periods": n_periods, "periods": periods}, f)
+        os.replace(temporary, os.path.join(path, META_FILE))
+
+    def _map(self):
+        if self.n_periods and self.n_skus:
+            by_period = np.memmap(os.path.join(self.path, DATA_FILE), dtype=self.dtype, mode="r",
+                                  shape=(self.n_periods, self.n_skus))
+        else:
+            by_period = np.empty((self.n_periods, self.n_skus), dtype=self.dtype)
+        self.matrix = by_period.T  # SKUs x periods, a view
+
+    def append_periods(self, demand, labels=None):
+        """
+        Append one period (a vector with one value per SKU, in store order) or several (a
+        SKUs x periods matrix) to the end of the history, without rewriting what is stored.
+        """
+        demand = np.asarray(demand, dtype=self.dtype)
+        demand = demand[:, None] if demand.ndim == 1 else demand
+        if demand.shape[0] != self.n_skus:
+            raise ValueError(f"Expected demand for {self.n_skus} SKUs, got {demand.shape[0]}")
+        count = demand.shape[1]
+        labels = [str(self.n_periods + offset) for offset in range(count)] if labels is None else [str(label) for label in labels]
+        if len(labels) != count:
+            raise ValueError("One label is needed per appended period")
+
+        self.matrix = None  # release the memory map before the file grows
+        with open(os.path.join(self.path, DATA_FILE), "r+b") as f:
+            # Drop anything past the last recorded period, e.g. left by an interrupted append
+            f.truncate(self.n_periods * self.n_skus * self.dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(demand.T).tobytes())
+        self.n_periods += count
+        self.period_labels = self.period_labels + labels
+        self._write_meta(self.path, self.dtype.str, self.n_periods, self.period_labels)
+        self._map()
+
+    def rows(self, sku_ids):
+        """Row numbers of the given SKU ids; raises KeyError for ids not in the store."""
+        if self.n_skus == 0:
+            raise KeyError(f"Unknown SKU ids: {', '.join(map(str, np.atleast_1d(sku_ids)[:5]))}")
+        if self._sku_order is None:
+            self._sku_order = np.argsort(self.sku_ids, kind="stable")
+        sku_ids = np.asarray(sku_ids)
+        sorted_ids = self.sku_ids[self._sku_order]
+        positions = np.minimum(np.searchsorted(sorted_ids, sku_ids), self.n_skus - 1)
+        found = sorted_ids[positions] == sku_ids
+        if not np.all(found):
+            raise KeyError(f"Unknown SKU ids: {', '.join(map(str, np.atleast_1d(sku_ids)[~np.atleast_1d(found)][:5]))}")
+        return self._sku_order[positions]
+
+    def history(self, rows=slice(None), periods=slice(None)):
+        """
+        Demand for SKU rows x periods. Slices (e.g. rows=slice(0, 100_000), periods=slice(-104,
+        None)) return views into the memory map without copying; a list of rows is gathered
+        into a new array.
+        """
+        return self.matrix[rows, periods]
+
+    def sku_history(self, sku_id, periods=slice(None)):
+        return self.matrix[int(self.rows(sku_id)), periods]
+
+    def forecaster(self, rows=slice(None), periods=slice(None)):
+        """TimeSeriesForecast over a slice of the store, reading the mapped data in place."""
+        return TimeSeriesForecast(self.history(rows, periods))
+
+    def iter_blocks(self, block_skus=100_000, periods=slice(None)):
+        """Yield (row slice, SKUs x periods view) over the whole catalog, block_skus rows at a time."""
+        for start in range(0, self.n_skus, block_skus):
+            rows = slice(start, min(start + block_skus, self.n_skus))
+            yield rows, self.matrix[rows, periods]
+
+
+def main():
+    import tempfile
+    rng = np.random.default_rng(0)
+    skus, weeks = 200_000, 260
+    path = os.path.join(tempfile.mkdtemp(), "demand_store")
+    store = DemandStore.create(path, [f"SKU{i:07d}" for i in range(skus)])
+    for week in range(weeks):
+        store.append_periods(rng.poisson(20, skus), labels=[f"W{week + 1}"])
+    print(f"{store.n_skus} SKUs x {store.n_periods} weeks, "
+          f"{os.path.getsize(os.path.join(path, DATA_FILE)) / 1e9:.2f} GB on disk")
+
+    forecasts = []
+    for rows, block in store.iter_blocks(50_000, periods=slice(-52, None)):
+        forecasts.append(TimeSeriesForecast(block).simple_moving_average_series(4)[:, -1])
+    print(f"Last-week 4-week SMA for SKU0000042: {np.concatenate(forecasts)[store.rows('SKU0000042')]:.2f}")
+
+if __name__ == "__main__":
+    main()
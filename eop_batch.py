@@ -0,0 +1,370 @@
+from functools import lru_cache
+import numpy as np
+from z_score_table import z_score
+
+# Same parameters EOQCalculator.__init__ accepts, in the same order
+FIELDS = ("demand_rate", "demand_yearly", "purchase_cost", "holding_cost_rate", "holding_cost_per_unit",
+          "ordering_cost", "standard_deviation", "standard_deviation_per_day", "lead_time", "lead_time_days",
+          "service_level", "weeks_per_year", "days_per_year", "EOQ", "toggle_holding_stock")
+
+RESULT_FIELDS = ("demand_rate", "D", "purchase_cost", "holding_cost_rate", "H", "ordering_cost", "EOQ", "z",
+                 "standard_deviation", "lead_time", "lead_time_days", "weeks_per_year", "days_per_year",
+                 "safety_stock", "rop", "annual_holding_cost", "annual_ordering_cost",
+                 "annual_safety_stock_holding_cost", "total_annual_cost", "time_between_orders",
+                 "number_of_orders_per_year")
+
+# Fields the inverse solver can back out of a given EOQ
+SOLVED_FIELDS = ("D", "ordering_cost", "H", "holding_cost_rate", "purchase_cost", "demand_rate")
+
+_SOLVE_FORMULAS = {
+    "D": lambda v, Q: (Q ** 2 * v["H"]) / (2 * v["ordering_cost"]),
+    "ordering_cost": lambda v, Q: (Q ** 2 * v["H"]) / (2 * v["D"]),
+    "H": lambda v, Q: (2 * v["D"] * v["ordering_cost"]) / (Q ** 2),
+    "holding_cost_rate": lambda v, Q: v["H"] / v["purchase_cost"],
+    "purchase_cost": lambda v, Q: v["H"] / v["holding_cost_rate"],
+    "demand_rate": lambda v, Q: v["D"] / v["days_per_year"],
+}
+
+
+@lru_cache(maxsize=None)
+def _solve_plan(missing_code):
+    """
+    Replay the EOQCalculator.solve_missing_parameters branch chain once for a missing-value
+    pattern (bit i set = SOLVED_FIELDS[i] missing) and return the fields it derives, in order.
+    """
+    present = {name: not missing_code >> i & 1 for i, name in enumerate(SOLVED_FIELDS)}
+    plan = []
+
+    def derive(*names):
+        for name in names:
+            plan.append(name)
+            present[name] = True
+
+    if not present["D"] and present["ordering_cost"] and present["H"]:
+        derive("D", "demand_rate")
+    if not present["ordering_cost"] and present["D"] and present["H"]:
+        derive("ordering_cost")
+    if not present["H"] and present["D"] and present["ordering_cost"]:
+        derive("H")
+    if not present["holding_cost_rate"] and present["H"] and present["purchase_cost"]:
+        derive("holding_cost_rate")
+    if not present["purchase_cost"] and present["H"] and present["holding_cost_rate"]:
+        derive("purchase_cost")
+    if not present["demand_rate"] and present["D"]:
+        derive("demand_rate")
+    return tuple(plan)
+
+
+def solve_missing_parameters(EOQ, D=None, ordering_cost=None, H=None, holding_cost_rate=None, purchase_cost=None, demand_rate=None, days_per_year=365):
+    """
+    Batch inverse of EOQCalculator.solve_missing_parameters. Rows are grouped by which of
+    SOLVED_FIELDS are missing (NaN) and every group is solved with one vectorized formula
+    per derived field; rows whose EOQ is missing or not positive are left untouched.
+
+    Returns (values, derived): dicts keyed by SOLVED_FIELDS holding the completed arrays and
+    boolean masks of the rows where each field was derived.
+    """
+    EOQ = np.asarray(EOQ, dtype=float)
+    size = EOQ.size
+    values = {}
+    for name, value in zip(SOLVED_FIELDS + ("days_per_year",),
+                           (D, ordering_cost, H, holding_cost_rate, purchase_cost, demand_rate, days_per_year)):
+        value = np.nan if value is None else value
+        values[name] = np.broadcast_to(np.asarray(value, dtype=float), (size,)).copy()
+    derived = {name: np.zeros(size, dtype=bool) for name in SOLVED_FIELDS}
+
+    codes = np.zeros(size, dtype=np.int64)
+    for i, name in enumerate(SOLVED_FIELDS):
+        codes |= np.isnan(values[name]).astype(np.int64) << i
+    with np.errstate(invalid="ignore"):
+        codes[~(EOQ > 0)] = -1
+
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for rows in np.split(order, starts[1:]):
+            if not rows.size or codes[rows[0]] < 0:
+                continue
+            plan = _solve_plan(int(codes[rows[0]]))
+            if not plan:
+                continue
+            group = {name: column[rows] for name, column in values.items()}
+            for name in plan:
+                group[name] = _SOLVE_FORMULAS[name](group, EOQ[rows])
+                values[name][rows] = group[name]
+                derived[name][rows] = True
+
+    del values["days_per_year"]
+    return values, derived
+
+# Per-row error flags reported by BatchEOQCalculator(errors="coerce"); a row can carry several
+ERROR_NONE = 0
+ERROR_EOQ_INPUTS = 1
+ERROR_EOQ_ZERO_INPUT = 2
+ERROR_EOQ_MISSING = 4
+ERROR_HOLDING_COST = 8
+ERROR_ORDERING_INPUTS = 16
+ERROR_SAFETY_STOCK_INPUTS = 32
+ERROR_ROP_INPUTS = 64
+ERROR_DEMAND_RATE = 128
+
+ERROR_MESSAGES = {
+    ERROR_EOQ_INPUTS: "Insufficient parameters to calculate EOQ",
+    ERROR_EOQ_ZERO_INPUT: "D, H, and ordering cost must be non-zero for EOQ calculation",
+    ERROR_EOQ_MISSING: "EOQ must be calculated and non-zero",
+    ERROR_HOLDING_COST: "Holding cost per unit (H) must be non-zero before calculating holding cost",
+    ERROR_ORDERING_INPUTS: "Insufficient parameters to calculate ordering cost",
+    ERROR_SAFETY_STOCK_INPUTS: "Insufficient parameters to calculate safety stock",
+    ERROR_ROP_INPUTS: "Insufficient parameters to calculate ROP",
+    ERROR_DEMAND_RATE: "Demand rate cannot be zero for time between orders calculation",
+}
+
+
+def error_messages(code):
+    """Decode one error_codes entry into the messages of the flags it carries."""
+    return [message for flag, message in ERROR_MESSAGES.items() if int(code) & flag]
+
+
+def round_half_even(values):
+    """
+    Round an array to one decimal exactly like the builtin round(x, 1) does for Python floats.
+    np.round scales by 10 before rounding, which disagrees with the correctly rounded builtin
+    when x * 10 lands within an ulp of a .5 tie; those few rows fall back to the builtin.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 1)
+    scaled = values * 10
+    with np.errstate(invalid="ignore"):  # inf and NaN are never ties
+        ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) <= np.spacing(scaled))
+    for i in ties:
+        rounded.flat[i] = round(float(values.flat[i]), 1)
+    return rounded
+
+
+class BatchEOQCalculator:
+    def __init__(self, demand_rate=None, demand_yearly=None, purchase_cost=None, holding_cost_rate=None, holding_cost_per_unit=None, ordering_cost=None, standard_deviation=None, standard_deviation_per_day=None, lead_time=None, lead_time_days=None, service_level=None, weeks_per_year=None, days_per_year=365, EOQ=None, toggle_holding_stock=True, errors="raise"):
+        """
+        Vectorized EOQCalculator over a whole SKU catalog. Every parameter accepts None, a scalar
+        or a 1-D array with one entry per SKU; None and NaN both mean "not given".
+
+        errors="raise" raises ValueError for the first invalid row, like EOQCalculator does.
+        errors="coerce" never raises: invalid rows come back as NaN and error_codes holds a
+        bitwise OR of the ERROR_* flags explaining every row.
+        """
+        if errors not in ("raise", "coerce"):
+            raise ValueError("errors must be 'raise' or 'coerce'")
+        self.errors = errors
+        inputs = dict(demand_rate=demand_rate, demand_yearly=demand_yearly, purchase_cost=purchase_cost,
+                      holding_cost_rate=holding_cost_rate, holding_cost_per_unit=holding_cost_per_unit,
+                      ordering_cost=ordering_cost, standard_deviation=standard_deviation,
+                      standard_deviation_per_day=standard_deviation_per_day, lead_time=lead_time,
+                      lead_time_days=lead_time_days, service_level=service_level, weeks_per_year=weeks_per_year,
+                      days_per_year=days_per_year, EOQ=EOQ)
+        sizes = [np.size(value) for value in list(inputs.values()) + [toggle_holding_stock] if value is not None]
+        self.size = max(sizes, default=1)
+
+        for name, value in inputs.items():
+            setattr(self, name, self._column(value))
+        self.toggle_holding_stock = np.broadcast_to(np.asarray(toggle_holding_stock, dtype=bool), (self.size,)).copy()
+        self.H = None
+        self.D = None
+        self.z = None
+        self.derived = None
+        self.error_codes = np.zeros(self.size, dtype=np.uint16)
+
+        self.update_calculations()
+
+    @classmethod
+    def from_dataframe(cls, df, errors="raise", **defaults):
+        """Build from a DataFrame whose columns are named like the EOQCalculator parameters."""
+        params = dict(defaults, errors=errors)
+        for name in FIELDS:
+            if name in df.columns:
+                if name == "toggle_holding_stock":
+                    params[name] = df[name].to_numpy(dtype=bool)
+                else:
+                    params[name] = df[name].to_numpy(dtype=float, na_value=np.nan)
+        return cls(**params)
+
+    def _column(self, value):
+        if value is None:
+            return np.full(self.size, np.nan)
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.size,)).copy()
+
+    def _check(self, invalid, code, message=None):
+        """
+        Flag rows failing a precondition. With errors="raise" this raises the same ValueError the
+        scalar calculator would; with errors="coerce" the rows get `code` or-ed into
+        error_codes and the returned mask lets the caller NaN them out.
+        """
+        if self.errors == "coerce":
+            self.error_codes[invalid] |= code
+            return invalid
+        rows = np.flatnonzero(invalid)
+        if rows.size:
+            more = f" and {rows.size - 1} more" if rows.size > 1 else ""
+            raise ValueError(f"{message or ERROR_MESSAGES[code]} (row {rows[0]}{more})")
+        return invalid
+
+    def update_calculations(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.weeks_per_year = np.where(np.isnan(self.weeks_per_year), self.days_per_year / 7, self.weeks_per_year)
+
+            has_rate = ~np.isnan(self.demand_rate)
+            self.D = np.where(has_rate, self.demand_rate * self.days_per_year, self.demand_yearly)
+            self.demand_rate = np.where(has_rate, self.demand_rate, self.D / self.days_per_year)
+
+            self.H = np.where(~np.isnan(self.holding_cost_rate) & ~np.isnan(self.purchase_cost),
+                              self.holding_cost_rate * self.purchase_cost, np.nan)
+            self.H = np.where(np.isnan(self.holding_cost_per_unit), self.H, self.holding_cost_per_unit)
+
+            computable = np.isnan(self.EOQ) & ~np.isnan(self.D) & ~np.isnan(self.ordering_cost) & ~np.isnan(self.H)
+            if computable.any():
+                self.EOQ = np.where(computable, self.calculate_eoq(computable), self.EOQ)
+            self.solve_missing_parameters(self.EOQ > 0)
+
+            self.z = self.calculate_z_score(self.service_level)
+
+            self.standard_deviation = np.where(np.isnan(self.standard_deviation_per_day), self.standard_deviation,
+                                               self.standard_deviation_per_day * np.sqrt(self.days_per_year))
+
+            days_per_week = self.days_per_year / self.weeks_per_year
+            has_days = ~np.isnan(self.lead_time_days) & ~np.isnan(days_per_week)
+            self.lead_time = np.where(has_days, self.lead_time_days / days_per_week, self.lead_time)
+            self.lead_time_days = np.where(has_days, self.lead_time_days, self.lead_time * days_per_week)
+
+    def solve_missing_parameters(self, rows):
+        values, self.derived = solve_missing_parameters(
+            np.where(rows, self.EOQ, np.nan), D=self.D, ordering_cost=self.ordering_cost, H=self.H,
+            holding_cost_rate=self.holding_cost_rate, purchase_cost=self.purchase_cost,
+            demand_rate=self.demand_rate, days_per_year=self.days_per_year)
+        for name in SOLVED_FIELDS:
+            setattr(self, name, values[name])
+
+    def calculate_eoq(self, rows=None):
+        rows = np.ones(self.size, dtype=bool) if rows is None else rows
+        bad = self._check(rows & (np.isnan(self.D) | np.isnan(self.ordering_cost) | np.isnan(self.H)), ERROR_EOQ_INPUTS)
+        bad |= self._check(rows & ((self.D == 0) | (self.H == 0) | (self.ordering_cost == 0)), ERROR_EOQ_ZERO_INPUT)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(rows & ~bad, np.sqrt((2 * self.D * self.ordering_cost) / self.H), np.nan)
+
+    def calculate_z_score(self, service_level):
+        return z_score(service_level)
+
+    def _check_eoq(self, message):
+        return self._check(np.isnan(self.EOQ) | (self.EOQ == 0), ERROR_EOQ_MISSING, message)
+
+    def calculate_safety_stock(self):
+        active = self.toggle_holding_stock
+        bad = self._check(active & (np.isnan(self.standard_deviation) | np.isnan(self.z)), ERROR_SAFETY_STOCK_INPUTS)
+        bad |= self._check(active & np.isnan(self.lead_time) & np.isnan(self.lead_time_days), ERROR_SAFETY_STOCK_INPUTS)
+        with np.errstate(invalid="ignore"):
+            lead_time = np.where(np.isnan(self.lead_time),
+                                 self.lead_time_days / (self.days_per_year / self.weeks_per_year), self.lead_time)
+            safety_stock = round_half_even(self.z * (self.standard_deviation * np.sqrt(lead_time)))
+        return np.where(active, np.where(bad, np.nan, safety_stock), 0.0)
+
+    def calculate_rop(self, safety_stock=None):
+        active = self.toggle_holding_stock
+        bad = self._check(active & np.isnan(self.demand_rate), ERROR_ROP_INPUTS)
+        if safety_stock is None:
+            safety_stock = self.calculate_safety_stock()
+        bad |= self._check(active & np.isnan(self.lead_time) & np.isnan(self.lead_time_days), ERROR_ROP_INPUTS)
+        rop = np.where(np.isnan(self.lead_time),
+                       self.demand_rate * self.lead_time_days + safety_stock,
+                       self.demand_rate * self.lead_time * (self.days_per_year / self.weeks_per_year) + safety_stock)
+        return np.where(active, np.where(bad, np.nan, round_half_even(rop)), 0.0)
+
+    def annual_holding_cost(self):
+        bad = self._check_eoq("EOQ must be calculated and non-zero before calculating holding cost")
+        bad |= self._check(np.isnan(self.H) | (self.H == 0), ERROR_HOLDING_COST)
+        return np.where(bad, np.nan, round_half_even((self.EOQ / 2) * self.H))
+
+    def annual_ordering_cost(self):
+        bad = self._check_eoq("EOQ must be calculated and non-zero before calculating ordering cost")
+        bad |= self._check(np.isnan(self.D) | np.isnan(self.ordering_cost), ERROR_ORDERING_INPUTS)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(bad, np.nan, round_half_even((self.D / self.EOQ) * self.ordering_cost))
+
+    def annual_safety_stock_holding_cost(self, safety_stock=None):
+        if safety_stock is None:
+            safety_stock = self.calculate_safety_stock()
+        active = self.toggle_holding_stock
+        with np.errstate(invalid="ignore"):
+            return np.where(active, round_half_even(safety_stock * self.H), 0.0)
+
+    def total_annual_cost(self, holding_cost=None, ordering_cost=None, safety_stock_cost=None):
+        holding_cost = self.annual_holding_cost() if holding_cost is None else holding_cost
+        ordering_cost = self.annual_ordering_cost() if ordering_cost is None else ordering_cost
+        safety_stock_cost = self.annual_safety_stock_holding_cost() if safety_stock_cost is None else safety_stock_cost
+        return round_half_even(holding_cost + ordering_cost + safety_stock_cost)
+
+    def time_between_orders(self):
+        bad = self._check_eoq("EOQ must be calculated and non-zero before calculating time between orders")
+        bad |= self._check(np.isnan(self.demand_rate), ERROR_DEMAND_RATE,
+                           "Insufficient parameters to calculate time between orders")
+        bad |= self._check(self.demand_rate == 0, ERROR_DEMAND_RATE)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(bad, np.nan, round_half_even(self.EOQ / self.demand_rate))
+
+    def number_of_orders_per_year(self):
+        bad = self._check_eoq("EOQ must be calculated and non-zero before calculating number of orders")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(bad, np.nan, round_half_even(self.D / self.EOQ))
+
+    def results(self):
+        """Every figure EOQProcessor.generate_results_table reports, as arrays keyed by RESULT_FIELDS."""
+        safety_stock = self.calculate_safety_stock()
+        holding_cost = self.annual_holding_cost()
+        ordering_cost = self.annual_ordering_cost()
+        safety_stock_cost = self.annual_safety_stock_holding_cost(safety_stock)
+        return {
+            "demand_rate": self.demand_rate,
+            "D": self.D,
+            "purchase_cost": self.purchase_cost,
+            "holding_cost_rate": self.holding_cost_rate,
+            "H": self.H,
+            "ordering_cost": self.ordering_cost,
+            "EOQ": self.EOQ,
+            "z": self.z,
+            "standard_deviation": self.standard_deviation,
+            "lead_time": self.lead_time,
+            "lead_time_days": self.lead_time_days,
+            "weeks_per_year": self.weeks_per_year,
+            "days_per_year": self.days_per_year,
+            "safety_stock": safety_stock,
+            "rop": self.calculate_rop(safety_stock),
+            "annual_holding_cost": holding_cost,
+            "annual_ordering_cost": ordering_cost,
+            "annual_safety_stock_holding_cost": safety_stock_cost,
+            "total_annual_cost": self.total_annual_cost(holding_cost, ordering_cost, safety_stock_cost),
+            "time_between_orders": self.time_between_orders(),
+            "number_of_orders_per_year": self.number_of_orders_per_year(),
+        }
+
+    def to_dataframe(self):
+        from pandas import DataFrame
+        df = DataFrame(self.results(), columns=list(RESULT_FIELDS))
+        if self.errors == "coerce":
+            df["error_code"] = self.error_codes
+        return df
+
+
+def main():
+    rng = np.random.default_rng(0)
+    skus = 1_000_000
+    calculator = BatchEOQCalculator(
+        demand_rate=rng.uniform(1, 50, skus),  # units per day
+        purchase_cost=rng.uniform(1, 100, skus),  # dollars per unit
+        holding_cost_rate=0.28,
+        ordering_cost=rng.uniform(20, 80, skus),  # dollars per order
+        standard_deviation_per_day=rng.uniform(1, 10, skus),  # units per day
+        lead_time_days=rng.integers(1, 30, skus),  # days
+        service_level=0.95,
+        days_per_year=312,
+    )
+    print(calculator.to_dataframe().describe().T)
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,61 @@
 import math
-from numpy import linspace
-import matplotlib.pyplot as plt
-from scipy.stats import norm
+from z_score_table import z_score
+
+# Dependency graph of the calculator: each node owns the derived quantities computed from
+# the inputs it lists and from the nodes upstream of it. Nodes are kept in topological order.
+_NODE_ORDER = ("calendar", "demand", "holding", "eoq", "z", "sigma", "lead_time")
+_NODE_INPUTS = {
+    "calendar": ("days_per_year", "weeks_per_year"),
+    "demand": ("demand_rate", "demand_yearly"),
+    "holding": ("holding_cost_rate", "purchase_cost", "holding_cost_per_unit"),
+    "eoq": ("ordering_cost", "EOQ"),
+    "z": ("service_level",),
+    "sigma": ("standard_deviation", "standard_deviation_per_day"),
+    "lead_time": ("lead_time", "lead_time_days"),
+}
+_NODE_UPSTREAM = {
+    "calendar": (),
+    "demand": ("calendar",),
+    "holding": (),
+    "eoq": ("demand", "holding"),
+    "z": (),
+    "sigma": ("calendar",),
+    "lead_time": ("calendar",),
+}
+
+
+def _downstream(node):
+    nodes = {node}
+    for other in _NODE_ORDER:
+        if any(upstream in nodes for upstream in _NODE_UPSTREAM[other]):
+            nodes.add(other)
+    return nodes
+
+_INPUT_NODES = {name: node for node, inputs in _NODE_INPUTS.items() for name in inputs}
+_DOWNSTREAM = {node: _downstream(node) for node in _NODE_ORDER}
 
 class EOQCalculator:
     def __init__(self, demand_rate=None, demand_yearly=None, purchase_cost=None, holding_cost_rate=None, holding_cost_per_unit=None, ordering_cost=None, standard_deviation=None, standard_deviation_per_day=None, lead_time=None, lead_time_days=None, service_level=None, weeks_per_year=None, days_per_year=365, EOQ=None, toggle_holding_stock=True):
-        self.demand_rate = demand_rate  # units per day
-        self.demand_yearly = demand_yearly  # units per year
-        self.purchase_cost = purchase_cost  # cost per unit
-        self.holding_cost_rate = holding_cost_rate  # holding cost rate per year
-        self.holding_cost_per_unit = holding_cost_per_unit  # holding cost per unit per year
-        self.ordering_cost = ordering_cost  # cost per order
-        self.standard_deviation = standard_deviation  # standard deviation of demand
-        self.standard_deviation_per_day = standard_deviation_per_day  # standard deviation of demand per day
-        self.lead_time = lead_time  # lead time in weeks
-        self.lead_time_days = lead_time_days  # lead time in days
-        self.service_level = service_level  # service level as a decimal (e.g., 0.9 for 90%)
-        self.weeks_per_year = weeks_per_year if weeks_per_year is not None else days_per_year / 7  # number of weeks in a year
-        self.days_per_year = days_per_year  # number of operational days in a year
-        self.EOQ = EOQ
+        # Values as given by the caller; the public attributes below also hold derived values
+        self._inputs = {
+            "demand_rate": demand_rate,  # units per day
+            "demand_yearly": demand_yearly,  # units per year
+            "purchase_cost": purchase_cost,  # cost per unit
+            "holding_cost_rate": holding_cost_rate,  # holding cost rate per year
+            "holding_cost_per_unit": holding_cost_per_unit,  # holding cost per unit per year
+            "ordering_cost": ordering_cost,  # cost per order
+            "standard_deviation": standard_deviation,  # standard deviation of demand
+            "standard_deviation_per_day": standard_deviation_per_day,  # standard deviation of demand per day
+            "lead_time": lead_time,  # lead time in weeks
+            "lead_time_days": lead_time_days,  # lead time in days
+            "service_level": service_level,  # service level as a decimal (e.g., 0.9 for 90%)
+            "weeks_per_year": weeks_per_year,  # number of weeks in a year, days_per_year / 7 if not given
+            "days_per_year": days_per_year,  # number of operational days in a year
+            "EOQ": EOQ,
+        }
+        self._base = {}
+        self._published = {}  # public input attributes as the last recalculation left them
+        self.version = 0  # bumped on every recalculation so cached results can tell they are stale
         self.H = None
         self.D = None
         self.z = None
@@ -27,23 +64,82 @@ class EOQCalculator:
         self.update_calculations()
 
     def update_calculations(self):
+        self._sync_inputs()
+        self._dirty = set(_NODE_ORDER)
+        self._recompute()
+
+    def _sync_inputs(self):
+        # An input attribute assigned directly (calc.demand_rate = 20) no longer holds what the
+        # last recalculation left there; take it as the new input so it is not overwritten
+        for name, published in self._published.items():
+            value = getattr(self, name)
+            if value is not published and value != published:
+                self._inputs[name] = value
+                self._dirty |= _DOWNSTREAM[_INPUT_NODES[name]]
+
+    def _recompute(self):
+        # Only the dirty nodes run, in topological order, so every derived value is rebuilt
+        # from the given inputs and from upstream values that are already current
+        for node in _NODE_ORDER:
+            if node in self._dirty:
+                getattr(self, "_compute_" + node)()
+        self._dirty = set()
+        self._published = {name: getattr(self, name) for name in self._inputs}
+        self.version += 1
+
+    def _compute_calendar(self):
+        self.days_per_year = self._inputs["days_per_year"]
+        self.weeks_per_year = self._inputs["weeks_per_year"]
+        if self.weeks_per_year is None and self.days_per_year is not None:
+            self.weeks_per_year = self.days_per_year / 7
+
+    def _compute_demand(self):
+        self.demand_rate = self._inputs["demand_rate"]
+        self.demand_yearly = self._inputs["demand_yearly"]
+        self.D = None
         if self.demand_rate is not None:
             self.D = self.demand_rate * self.days_per_year  # annual demand in units/year
         elif self.demand_yearly is not None:
             self.D = self.demand_yearly
             self.demand_rate = self.D / self.days_per_year  # calculate daily demand from annual demand
+        self._base.update(D=self.D, demand_rate=self.demand_rate)
+
+    def _compute_holding(self):
+        self.holding_cost_rate = self._inputs["holding_cost_rate"]
+        self.purchase_cost = self._inputs["purchase_cost"]
+        self.holding_cost_per_unit = self._inputs["holding_cost_per_unit"]
+        self.H = None
         if self.holding_cost_rate is not None and self.purchase_cost is not None:
             self.H = self.holding_cost_rate * self.purchase_cost  # annual holding cost per unit
         if self.holding_cost_per_unit is not None:
             self.H = self.holding_cost_per_unit
+        self._base.update(H=self.H, holding_cost_rate=self.holding_cost_rate, purchase_cost=self.purchase_cost)
+
+    def _compute_eoq(self):
+        # solve_missing_parameters back-fills demand and holding values, so start from what the
+        # upstream nodes produced rather than from an earlier back-fill
+        for name, value in self._base.items():
+            setattr(self, name, value)
+        self.ordering_cost = self._inputs["ordering_cost"]
+        self.EOQ = self._inputs["EOQ"]
         if self.D is not None and self.ordering_cost is not None and self.H is not None and self.EOQ is None:
             self.EOQ = self.calculate_eoq()
         if self.EOQ is not None and self.EOQ > 0:
             self.solve_missing_parameters()
-        if self.service_level is not None:
-            self.z = self.calculate_z_score(self.service_level)
+
+    def _compute_z(self):
+        self.service_level = self._inputs["service_level"]
+        self.z = self.calculate_z_score(self.service_level) if self.service_level is not None else None
+
+    def _compute_sigma(self):
+        self.standard_deviation = self._inputs["standard_deviation"]
+        self.standard_deviation_per_day = self._inputs["standard_deviation_per_day"]
         if self.standard_deviation_per_day is not None:
             self.standard_deviation = self.standard_deviation_per_day * math.sqrt(self.days_per_year)
+
+    def _compute_lead_time(self):
+        self.lead_time = self._inputs["lead_time"]
+        self.lead_time_days = self._inputs["lead_time_days"]
         if self.lead_time_days is not None and self.days_per_year is not None and self.weeks_per_year is not None:
             self.lead_time = self.lead_time_days / (self.days_per_year / self.weeks_per_year)
         elif self.lead_time is not None and self.days_per_year is not None and self.weeks_per_year is not None:
@@ -65,38 +161,31 @@ class EOQCalculator:
             self.demand_rate = self.D / self.days_per_year
 
     def set_parameters(self, demand_rate=None, demand_yearly=None, purchase_cost=None, holding_cost_rate=None, holding_cost_per_unit=None, ordering_cost=None, standard_deviation=None, standard_deviation_per_day=None, lead_time=None, lead_time_days=None, service_level=None, weeks_per_year=None, days_per_year=None, EOQ=None, toggle_holding_stock=None):
-        if demand_rate is not None:
-            self.demand_rate = demand_rate
-        if demand_yearly is not None:
-            self.demand_yearly = demand_yearly
-        if purchase_cost is not None:
-            self.purchase_cost = purchase_cost
-        if holding_cost_rate is not None:
-            self.holding_cost_rate = holding_cost_rate
-        if holding_cost_per_unit is not None:
-            self.holding_cost_per_unit = holding_cost_per_unit
-        if ordering_cost is not None:
-            self.ordering_cost = ordering_cost
-        if standard_deviation is not None:
-            self.standard_deviation = standard_deviation
-        if standard_deviation_per_day is not None:
-            self.standard_deviation_per_day = standard_deviation_per_day
-        if lead_time is not None:
-            self.lead_time = lead_time
-        if lead_time_days is not None:
-            self.lead_time_days = lead_time_days
-        if service_level is not None:
-            self.service_level = service_level
-        if weeks_per_year is not None:
-            self.weeks_per_year = weeks_per_year
-        if days_per_year is not None:
-            self.days_per_year = days_per_year
-        if EOQ is not None:
-            self.EOQ = EOQ
+        changes = {
+            "demand_rate": demand_rate,
+            "demand_yearly": demand_yearly,
+            "purchase_cost": purchase_cost,
+            "holding_cost_rate": holding_cost_rate,
+            "holding_cost_per_unit": holding_cost_per_unit,
+            "ordering_cost": ordering_cost,
+            "standard_deviation": standard_deviation,
+            "standard_deviation_per_day": standard_deviation_per_day,
+            "lead_time": lead_time,
+            "lead_time_days": lead_time_days,
+            "service_level": service_level,
+            "weeks_per_year": weeks_per_year,
+            "days_per_year": days_per_year,
+            "EOQ": EOQ,
+        }
+        self._sync_inputs()
+        for name, value in changes.items():
+            if value is not None and value != self._inputs[name]:
+                self._inputs[name] = value
+                self._dirty |= _DOWNSTREAM[_INPUT_NODES[name]]
         if toggle_holding_stock is not None:
             self.toggle_holding_stock = toggle_holding_stock
 
-        self.update_calculations()
+        self._recompute()
 
     def calculate_eoq(self):
         if self.D is None or self.ordering_cost is None or self.H is None:
@@ -106,7 +195,7 @@ class EOQCalculator:
         return math.sqrt((2 * self.D * self.ordering_cost) / self.H)
 
     def calculate_z_score(self, service_level):
-        return norm.ppf(service_level)
+        return z_score(service_level)
 
     def calculate_safety_stock(self):
         if not self.toggle_holding_stock:
@@ -122,12 +211,13 @@ class EOQCalculator:
         safety_stock = self.z * sigma_dLT
         return round(safety_stock, 1)
 
-    def calculate_rop(self):
+    def calculate_rop(self, safety_stock=None):
         if not self.toggle_holding_stock:
             return 0
         if self.demand_rate is None:
             raise ValueError("Insufficient parameters to calculate ROP")
-        safety_stock = self.calculate_safety_stock()
+        if safety_stock is None:
+            safety_stock = self.calculate_safety_stock()
         if self.lead_time is not None:
             return round(self.demand_rate * self.lead_time * (self.days_per_year / self.weeks_per_year) + safety_stock, 1)
         elif self.lead_time_days is not None:
@@ -147,16 +237,23 @@ class EOQCalculator:
             raise ValueError("EOQ must be calculated and non-zero before calculating ordering cost")
         return round((self.D / self.EOQ) * self.ordering_cost, 1)
 
-    def annual_safety_stock_holding_cost(self):
+    def annual_safety_stock_holding_cost(self, safety_stock=None):
         if not self.toggle_holding_stock:
             return 0
-        safety_stock = self.calculate_safety_stock()
+        if safety_stock is None:
+            safety_stock = self.calculate_safety_stock()
         return round(safety_stock * self.H, 1)
 
-    def total_annual_cost(self):
-        holding_cost = self.annual_holding_cost()
-        ordering_cost = self.annual_ordering_cost()
-        safety_stock_cost = self.annual_safety_stock_holding_cost() if self.toggle_holding_stock else 0
+    def total_annual_cost(self, holding_cost=None, ordering_cost=None, safety_stock_cost=None):
+        # Figures already computed by the caller can be passed in instead of being recomputed
+        if holding_cost is None:
+            holding_cost = self.annual_holding_cost()
+        if ordering_cost is None:
+            ordering_cost = self.annual_ordering_cost()
+        if not self.toggle_holding_stock:
+            safety_stock_cost = 0
+        elif safety_stock_cost is None:
+            safety_stock_cost = self.annual_safety_stock_holding_cost()
         return round(holding_cost + ordering_cost + safety_stock_cost, 1)
 
     def time_between_orders(self):
@@ -175,6 +272,10 @@ class EOQCalculator:
         if self.EOQ is None or self.EOQ == 0:
             raise ValueError("EOQ must be calculated and non-zero before plotting costs")
 
+        # Deferred so the calculator itself starts without loading matplotlib
+        from numpy import linspace
+        import matplotlib.pyplot as plt
+
         Q_range = linspace(1, 2 * self.EOQ, 500)
 
         holding_costs = (Q_range / 2) * self.H if self.toggle_holding_stock else 0
@@ -0,0 +1,52 @@
+import argparse
+import numpy as np
+from chunked_io import iter_table_chunks, TableChunkWriter
+from eop_batch import BatchEOQCalculator, FIELDS
+
+
+def process_catalog(input_path, output_path, chunksize=100_000, quiet=False, **defaults):
+    """
+    Stream a SKU catalog from CSV or Parquet through BatchEOQCalculator and write the results
+    to CSV or Parquet (picked from the file extensions), one chunk at a time, so peak memory is
+    bounded by `chunksize` rather than by the size of the file.
+
+    Catalog columns named like the EOQCalculator parameters are used as inputs; `defaults`
+    fills parameters the catalog does not carry (e.g. days_per_year=312). Every other column,
+    such as a SKU id, is passed through to the output. Invalid rows do not stop the run: their
+    results are NaN and the error_code column says why (see eop_batch.error_messages).
+
+    Returns a summary dict with the number of chunks, rows and rows with errors.
+    """
+    summary = {"chunks": 0, "rows": 0, "rows_with_errors": 0}
+    with TableChunkWriter(output_path) as writer:
+        for chunk in iter_table_chunks(input_path, chunksize=chunksize):
+            calculator = BatchEOQCalculator.from_dataframe(chunk, errors="coerce", **defaults)
+            results = calculator.to_dataframe()
+            passthrough = [column for column in chunk.columns if column not in FIELDS and column not in results.columns]
+            for position, column in enumerate(passthrough):
+                results.insert(position, column, chunk[column].to_numpy())
+            writer.write(results)
+
+            summary["chunks"] += 1
+            summary["rows"] += len(results)
+            summary["rows_with_errors"] += int(np.count_nonzero(calculator.error_codes))
+            if not quiet:
+                print(f"Processed chunk {summary['chunks']}: {summary['rows']} rows so far")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute EOQ, safety stock and ROP for a SKU catalog in chunks.")
+    parser.add_argument("input_path", help="catalog file (.csv or .parquet)")
+    parser.add_argument("output_path", help="results file (.csv or .parquet)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk")
+    parser.add_argument("--days-per-year", type=float, default=365, help="used when the catalog has no days_per_year column")
+    args = parser.parse_args()
+
+    summary = process_catalog(args.input_path, args.output_path, chunksize=args.chunksize,
+                              days_per_year=args.days_per_year)
+    print(f"Results exported to {args.output_path}: {summary['rows']} rows in {summary['chunks']} chunks, "
+          f"{summary['rows_with_errors']} rows with errors")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from eop_processor import EOQProcessor
+from gui_worker import GuiWorker, ProgressPanel
+from results_view import ResultsView
 import os
 import numpy as np
 
@@ -69,9 +71,18 @@ class EOQApp:
         self.plot_button = ttk.Button(button_frame, text="Visualize", command=self.visualize)
         self.plot_button.grid(row=0, column=2, padx=10)
 
-        # Text area for displaying results
-        self.results_text = tk.Text(parent, height=15, width=80, wrap=tk.WORD)
-        self.results_text.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        # Input and result tables, one tab each
+        self.results_tabs = ttk.Notebook(parent)
+        self.results_tabs.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.inputs_view = ResultsView(self.results_tabs, height=12, filter_box=False)
+        self.results_view = ResultsView(self.results_tabs, height=12)
+        self.results_tabs.add(self.inputs_view, text="Inputs Table")
+        self.results_tabs.add(self.results_view, text="Results Table")
+
+        # Calculations and the Excel export run on a worker thread, reported here
+        self.progress_panel = ProgressPanel(parent)
+        self.progress_panel.grid(row=5, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+        self.worker = GuiWorker(parent, self.progress_panel)
         
         # Path for saved Excel file
         self.excel_path = os.path.join(os.path.expanduser("~"), "Downloads", "eoq_results.xlsx")
@@ -115,8 +126,11 @@ class EOQApp:
             return
 
         print("Inputs:", inputs)  # Debugging: Print inputs to console
+        excel_path = self.excel_path
 
-        try:
+        def job(task):
+            # Runs on a worker thread: no widget access here
+            task.report(0.1, "Calculating...")
             processor = EOQProcessor(
                 demand_rate=inputs.get('demand_rate'),
                 demand_yearly=inputs.get('demand_yearly'),
@@ -132,43 +146,49 @@ class EOQApp:
                 EOQ=inputs.get('EOQ'),
                 toggle_holding_stock=inputs.get('toggle_holding_stock')
             )
-
+            if not full_set:
+                processor.calculator.print_results(full_set=False)
+                return processor, None, None
+
+            # Generate the tables, then export results to Excel
+            input_table = processor.generate_input_table()
+            results_table = processor.generate_results_table()
+            print("Input Table:\n", input_table)  # Debugging: Print input table
+            print("Results Table:\n", results_table)  # Debugging: Print results table
+            task.check_cancelled()
+            task.report(0.5, "Exporting to Excel...")
+            processor.export_to_excel(excel_path)
+            return processor, input_table, results_table
+
+        def done(result):
+            processor, input_table, results_table = result
             if full_set:
-                # Generate and display tables
-                input_table = processor.generate_input_table()
-                results_table = processor.generate_results_table()
-
-                print("Input Table:\n", input_table)  # Debugging: Print input table
-                print("Results Table:\n", results_table)  # Debugging: Print results table
-
                 self.display_results(input_table, results_table)
-
-                # Export results to Excel
-                processor.export_to_excel(self.excel_path)
                 messagebox.showinfo("Download Successful", "Downloaded Solution Excel. Check your Downloads folder.")
             else:
-                processor.calculator.print_results(full_set=False)
                 self.display_eoq_only_results(processor)
 
-        except Exception as e:
-            messagebox.showerror("Calculation Error", f"An error occurred during calculation: {e}")
+        def failed(error):
+            messagebox.showerror("Calculation Error", f"An error occurred during calculation: {error}")
+
+        self.worker.submit(job, on_done=done, on_error=failed,
+                           disable=(self.calculate_eoq_button, self.calculate_full_button, self.plot_button))
 
     def display_results(self, input_table, results_table):
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(tk.END, "Inputs Table:\n")
-        self.results_text.insert(tk.END, input_table.to_string(index=False))
-        self.results_text.insert(tk.END, "\n\nResults Table:\n")
-        self.results_text.insert(tk.END, results_table.to_string(index=False))
+        self.inputs_view.set_data(input_table)
+        self.results_view.set_data(results_table)
+        self.results_tabs.select(self.results_view)
 
     def display_eoq_only_results(self, processor):
+        from pandas import DataFrame
         input_table = processor.generate_input_table()
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(tk.END, "Inputs Table:\n")
-        self.results_text.insert(tk.END, input_table.to_string(index=False))
-        self.results_text.insert(tk.END, "\n\nEOQ Calculation Results:\n")
-        self.results_text.insert(tk.END, f"Economic Order Quantity (EOQ): {processor.calculator.EOQ} units\n")
-        self.results_text.insert(tk.END, f"Number of Orders per Year: {processor.calculator.number_of_orders_per_year()}\n")
-        self.results_text.insert(tk.END, f"Time Between Orders (TBO): {processor.calculator.time_between_orders()} days\n")
+        self.inputs_view.set_data(input_table)
+        self.results_view.set_data(DataFrame({
+            'Parameter': ['Economic Order Quantity (EOQ) (units)', 'Number of Orders per Year', 'Time Between Orders (TBO) (days)'],
+            'Value': [processor.calculator.EOQ, processor.calculator.number_of_orders_per_year(),
+                      processor.calculator.time_between_orders()],
+        }))
+        self.results_tabs.select(self.results_view)
 
     def visualize(self):
         inputs = self.get_input_values()
@@ -1,9 +1,58 @@
 from numpy import linspace
 import numpy as np
-from pandas import DataFrame, ExcelWriter
-import matplotlib.pyplot as plt
 from eop_calculations import EOQCalculator
-import pandas as pd
+
+class EOQResults:
+    def __init__(self, calculator):
+        """
+        Snapshot of the derived metrics of one calculator parameter state. Each metric is
+        computed at most once and reused by the metrics built on top of it.
+        """
+        self.calculator = calculator
+        self.version = calculator.version
+        self._values = {}
+
+    def is_current(self):
+        return self.version == self.calculator.version
+
+    def _get(self, name, compute):
+        if name not in self._values:
+            self._values[name] = compute()
+        return self._values[name]
+
+    @property
+    def holding_cost(self):
+        return self._get("holding_cost", self.calculator.annual_holding_cost)
+
+    @property
+    def ordering_cost(self):
+        return self._get("ordering_cost", self.calculator.annual_ordering_cost)
+
+    @property
+    def safety_stock(self):
+        return self._get("safety_stock", self.calculator.calculate_safety_stock)
+
+    @property
+    def safety_stock_cost(self):
+        return self._get("safety_stock_cost",
+                         lambda: self.calculator.annual_safety_stock_holding_cost(self.safety_stock))
+
+    @property
+    def total_cost(self):
+        return self._get("total_cost", lambda: self.calculator.total_annual_cost(
+            self.holding_cost, self.ordering_cost, self.safety_stock_cost))
+
+    @property
+    def time_between_orders(self):
+        return self._get("time_between_orders", self.calculator.time_between_orders)
+
+    @property
+    def rop(self):
+        return self._get("rop", lambda: self.calculator.calculate_rop(self.safety_stock))
+
+    @property
+    def orders_per_year(self):
+        return self._get("orders_per_year", self.calculator.number_of_orders_per_year)
 
 class EOQProcessor:
     def __init__(self, demand_rate=None, demand_yearly=None, purchase_cost=None, holding_cost_rate=None, holding_cost_per_unit=None, ordering_cost=None, standard_deviation=None, standard_deviation_per_day=None, lead_time=None, lead_time_days=None, service_level=None, weeks_per_year=52, days_per_year=365, EOQ=None, toggle_holding_stock=True):
@@ -25,6 +74,8 @@ class EOQProcessor:
             toggle_holding_stock=toggle_holding_stock
         )
 
+        self._results = None
+
         # Ensure EOQ is calculated
         self.calculate_eoq()
 
@@ -34,6 +85,18 @@ class EOQProcessor:
         except ValueError as e:
             raise ValueError("EOQ calculation failed: " + str(e))
 
+    def set_parameters(self, **parameters):
+        self.calculator.set_parameters(**parameters)
+        self._results = None
+
+    def results(self):
+        """Derived metrics for the current parameters, cached until the parameters change."""
+        if self._results is None or not self._results.is_current():
+            if self.calculator.EOQ is None:
+                self.calculator.calculate_eoq()
+            self._results = EOQResults(self.calculator)
+        return self._results
+
     def generate_input_table(self):
         inputs = {
             "Parameter": ["Demand Rate (units/day)", "Demand Yearly (units/year)", "Purchase Cost (dollars/unit)", 
@@ -44,33 +107,32 @@ class EOQProcessor:
                       self.calculator.standard_deviation_per_day, self.calculator.standard_deviation, self.calculator.lead_time_days, self.calculator.service_level * 100 if self.calculator.service_level else None, 
                       self.calculator.weeks_per_year, self.calculator.days_per_year, self.calculator.EOQ, self.calculator.toggle_holding_stock, self.calculator.z]
         }
-        input_df = pd.DataFrame(inputs)
+        from pandas import DataFrame
+        input_df = DataFrame(inputs)
         return input_df
     
-    def generate_results_table(self):
-        if self.calculator.EOQ is None:
-            self.calculator.calculate_eoq()
-
-        # Print intermediate values for debugging
-        holding_cost = self.calculator.annual_holding_cost()
-        ordering_cost = self.calculator.annual_ordering_cost()
-        safety_stock = self.calculator.calculate_safety_stock()
-        safety_stock_cost = self.calculator.annual_safety_stock_holding_cost()
-        total_cost = self.calculator.total_annual_cost()
-        TBO = self.calculator.time_between_orders()
-        ROP = self.calculator.calculate_rop()
+    def generate_results_table(self, quiet=False):
+        snapshot = self.results()
+        holding_cost = snapshot.holding_cost
+        ordering_cost = snapshot.ordering_cost
+        safety_stock = snapshot.safety_stock
+        safety_stock_cost = snapshot.safety_stock_cost
+        total_cost = snapshot.total_cost
+        TBO = snapshot.time_between_orders
+        ROP = snapshot.rop
         EOQ = self.calculator.EOQ
-        orders_per_year = self.calculator.number_of_orders_per_year()
-
-        # Print intermediate values for debugging
-        print(f"Holding Cost: {holding_cost}")
-        print(f"Ordering Cost: {ordering_cost}")
-        print(f"Safety Stock: {safety_stock}")
-        print(f"Safety Stock Cost: {safety_stock_cost}")
-        print(f"Total Cost: {total_cost}")
-        print(f"Time Between Orders: {TBO}")
-        print(f"Reorder Point: {ROP}")
-        print(f"EOQ: {EOQ}")
+        orders_per_year = snapshot.orders_per_year
+
+        if not quiet:
+            # Print intermediate values for debugging
+            print(f"Holding Cost: {holding_cost}")
+            print(f"Ordering Cost: {ordering_cost}")
+            print(f"Safety Stock: {safety_stock}")
+            print(f"Safety Stock Cost: {safety_stock_cost}")
+            print(f"Total Cost: {total_cost}")
+            print(f"Time Between Orders: {TBO}")
+            print(f"Reorder Point: {ROP}")
+            print(f"EOQ: {EOQ}")
 
         results = {
             "Parameter": ["Demand Rate (units/day)", "Demand Yearly (units/year)", "Purchase Cost (dollars/unit)", 
@@ -102,10 +164,22 @@ class EOQProcessor:
                             "Demand Yearly / EOQ"]
         }
         
-        results_df = pd.DataFrame(results)
+        from pandas import DataFrame
+        results_df = DataFrame(results)
         return results_df
 
-    def plot_costs(self, save_path=None):
+    def cost_figure(self):
+        """
+        The cost curves as a matplotlib Figure. It is built without pyplot, so it holds no
+        global state and can be drawn and saved from a worker thread.
+        """
+        # Deferred so building results tables never pays for importing matplotlib
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(10, 6))
+        self._draw_costs(figure)
+        return figure
+
+    def _draw_costs(self, figure):
         # Ensure EOQ is calculated and non-zero before plotting costs
         if self.calculator.EOQ is None or self.calculator.EOQ == 0:
             raise ValueError("EOQ must be calculated and non-zero before plotting costs")
@@ -119,26 +193,33 @@ class EOQProcessor:
         ordering_costs = (self.calculator.D / Q_range) * self.calculator.ordering_cost
         total_costs = holding_costs + ordering_costs
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(Q_range, holding_costs, label='Annual Holding Cost (Q/2 * H)', color='green')
-        plt.plot(Q_range, ordering_costs, label='Annual Ordering Cost (D/Q * S)', color='blue')
-        plt.plot(Q_range, total_costs, label='Total Annual Cost', color='red')
-        plt.axvline(self.calculator.EOQ, color='purple', linestyle='--', label=f'EOQ = {self.calculator.EOQ:.2f}')
-        plt.axhline(min(total_costs), color='orange', linestyle='--', label=f'Minimum Total Cost = ${min(total_costs):.2f}')
-        plt.xlabel('Order Quantity (Q)')
-        plt.ylabel('Cost ($)')
-        plt.title('EOQ Model: Costs vs. Order Quantity')
-        plt.legend()
-        plt.grid(True)
+        ax = figure.add_subplot()
+        ax.plot(Q_range, holding_costs, label='Annual Holding Cost (Q/2 * H)', color='green')
+        ax.plot(Q_range, ordering_costs, label='Annual Ordering Cost (D/Q * S)', color='blue')
+        ax.plot(Q_range, total_costs, label='Total Annual Cost', color='red')
+        ax.axvline(self.calculator.EOQ, color='purple', linestyle='--', label=f'EOQ = {self.calculator.EOQ:.2f}')
+        ax.axhline(min(total_costs), color='orange', linestyle='--', label=f'Minimum Total Cost = ${min(total_costs):.2f}')
+        ax.set_xlabel('Order Quantity (Q)')
+        ax.set_ylabel('Cost ($)')
+        ax.set_title('EOQ Model: Costs vs. Order Quantity')
+        ax.legend()
+        ax.grid(True)
 
+    def plot_costs(self, save_path=None):
         if save_path:
-            plt.savefig(save_path)
+            self.cost_figure().savefig(save_path)
         else:
+            # Showing a window needs pyplot, and so the main thread
+            import matplotlib.pyplot as plt
+            self._draw_costs(plt.figure(figsize=(10, 6)))
             plt.show()
 
-    def export_to_excel(self, filename="eoq_results.xlsx"):
+    def export_to_excel(self, filename="eoq_results.xlsx", quiet=False):
+        from io import BytesIO
+        from pandas import ExcelWriter
+
         input_df = self.generate_input_table()
-        results_df = self.generate_results_table()
+        results_df = self.generate_results_table(quiet=quiet)
         
         with ExcelWriter(filename, engine='xlsxwriter') as writer:
             input_df.to_excel(writer, sheet_name='Inputs', index=False)
@@ -161,12 +242,14 @@ class EOQProcessor:
             results_sheet.set_column('B:B', 20, general_format)  # Value column
             results_sheet.set_column('C:C', 40)  # Calculation column
 
-            # Insert the plot into the results sheet
-            plot_path = 'eoq_plot.png'
-            self.plot_costs(save_path=plot_path)
-            results_sheet.insert_image('D2', plot_path)
-        
-        print(f"Results exported to {filename}")
+            # Insert the plot into the results sheet, rendered in memory rather than to a shared
+            # file in the working directory
+            image = BytesIO()
+            self.cost_figure().savefig(image, format='png')
+            results_sheet.insert_image('D2', 'eoq_plot.png', {'image_data': image})
+
+        if not quiet:
+            print(f"Results exported to {filename}")
 
 def main():
     demand_rate_per_day = 15.0  # units per day
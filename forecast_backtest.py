@@ -0,0 +1,174 @@
+import numpy as np
+from forecast_error_processor import ForecastErrorProcessor
+from time_series_forecast import TimeSeriesForecast
+
+METHODS = ("sma", "wma", "es", "holt")
+MODES = ("expanding", "rolling")
+
+
+def _minimum_history(spec):
+    method = spec["method"]
+    if method == "sma":
+        return int(spec["window"])
+    if method == "wma":
+        return len(spec["weights"])
+    return 1 if method == "es" else 2
+
+
+class Backtest:
+    def __init__(self, history, methods, horizon=1, mode="expanding", window_length=None, first_origin=None,
+                 step=1, skus=None, periods=None):
+        """
+        Replay a demand history (one series or a SKUs x periods matrix) from a sequence of
+        forecast origins. At origin o only periods before o are known, and forecasts are made
+        for periods o .. o + horizon - 1.
+
+        methods:       dict label -> {"method": "sma" | "wma" | "es" | "holt", **parameters},
+                       e.g. {"SMA 4": {"method": "sma", "window": 4}, "ES": {"method": "es", "alpha": 0.3}}.
+        mode:          "expanding" fits ES and Holt on all history before the origin, "rolling"
+                       on the last `window_length` periods only (SMA and WMA are windowed anyway).
+        first_origin:  defaults to the shortest history every method (and the rolling window) needs.
+        skus, periods: optional labels for the rows and the periods, used in the output tables.
+        """
+        values = np.asarray(history, dtype=float)
+        self.values = values[None, :] if values.ndim == 1 else values
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if mode == "rolling" and not window_length:
+            raise ValueError("Rolling origins need a window_length")
+        for label, spec in methods.items():
+            if spec.get("method") not in METHODS:
+                raise ValueError(f"{label}: method must be one of {', '.join(METHODS)}")
+            if mode == "rolling" and _minimum_history(spec) > window_length:
+                raise ValueError(f"{label}: needs more history than the rolling window_length")
+        self.methods = dict(methods)
+        self.horizon = int(horizon)
+        self.mode = mode
+        self.window_length = window_length
+        needed = max([_minimum_history(spec) for spec in self.methods.values()] + [window_length or 1])
+        first_origin = needed if first_origin is None else max(int(first_origin), needed)
+        self.origins = np.arange(first_origin, self.values.shape[1], step)
+        if not self.origins.size:
+            raise ValueError("The history is too short for any forecast origin.")
+        self.skus = np.arange(len(self.values)) if skus is None else np.asarray(skus)
+        self.periods = np.arange(self.values.shape[1]) if periods is None else np.asarray(periods)
+
+    def forecasts(self, label, rows=slice(None)):
+        """
+        Forecasts of one method for the given SKU rows, shaped (SKUs, origins, horizon):
+        entry [:, i, h - 1] is the forecast made at origins[i] for period origins[i] + h - 1.
+
+        Nothing is refitted per origin: the moving averages and the expanding ES and Holt states
+        come from one pass over the full history, and a rolling fit is derived from those in
+        O(1) per origin (see _rolling_state).
+        """
+        spec = self.methods[label]
+        method = spec["method"]
+        values = self.values[rows]
+        series = TimeSeriesForecast(values)
+        origins = self.origins
+        steps = np.arange(1, self.horizon + 1)
+
+        if method == "sma":
+            level = series.simple_moving_average_series(spec["window"])[:, origins]
+        elif method == "wma":
+            level = series.weighted_moving_average_series(spec["weights"])[:, origins]
+        elif method == "es":
+            alpha = spec["alpha"]
+            fitted, _ = series.exponential_smoothing_series(alpha, spec.get("initial"))
+            level = fitted[:, origins]
+            if self.mode == "rolling":
+                # The rolling fit starts at the window's first observation instead of the full
+                # state there; that difference decays by (1 - alpha) per period
+                start = origins - self.window_length
+                level = level - (1 - alpha) ** self.window_length * (fitted[:, start] - values[:, start])
+        else:
+            alpha, beta = spec["alpha"], spec["beta"]
+            levels, trends = series.holt_states(alpha, beta)
+            level, trend = levels[:, origins - 1], trends[:, origins - 1]
+            if self.mode == "rolling":
+                level, trend = self._rolling_state(values, levels, trends, alpha, beta)
+            return level[..., None] + trend[..., None] * steps
+        return np.repeat(level[..., None], self.horizon, axis=-1)
+
+    def _rolling_state(self, values, levels, trends, alpha, beta):
+        # Holt is linear: state(t) = A @ state(t - 1) + b * demand(t). A fit started on the last
+        # window_length periods differs from the full-history fit only by its starting state,
+        # and that difference is carried forward by A ** (window_length - 1)
+        length = self.window_length
+        start = self.origins - length
+        transition = np.array([[1 - alpha, 1 - alpha], [-alpha * beta, 1 - alpha * beta]])
+        carry = np.linalg.matrix_power(transition, length - 1)
+        level_gap = levels[:, start] - values[:, start]
+        trend_gap = trends[:, start] - (values[:, start + 1] - values[:, start])
+        level = levels[:, self.origins - 1] - (carry[0, 0] * level_gap + carry[0, 1] * trend_gap)
+        trend = trends[:, self.origins - 1] - (carry[1, 0] * level_gap + carry[1, 1] * trend_gap)
+        return level, trend
+
+    def targets(self, rows=slice(None)):
+        """Actual demand for every forecast in forecasts(), NaN past the end of the history."""
+        values = self.values[rows]
+        target = self.origins[:, None] + np.arange(self.horizon)
+        actual = np.full(values.shape[:1] + target.shape, np.nan)
+        inside = target < values.shape[1]
+        actual[:, inside] = values[:, target[inside]]
+        return actual
+
+    def run(self, chunk_skus=10_000):
+        """
+        Bias (average forecast error), MAD and MAPE over all origins, per SKU, method and
+        horizon, as a long DataFrame. SKUs are processed `chunk_skus` rows at a time to bound
+        memory.
+        """
+        from pandas import DataFrame, concat
+        frames = []
+        evaluated = np.count_nonzero(self.origins[:, None] + np.arange(self.horizon) < self.values.shape[1], axis=0)
+        for chunk_start in range(0, len(self.values), chunk_skus):
+            rows = slice(chunk_start, chunk_start + chunk_skus)
+            actual = self.targets(rows)
+            skus = self.skus[rows]
+            for label in self.methods:
+                bias, mad, mape = ForecastErrorProcessor.error_statistics(self.forecasts(label, rows), actual, axis=1)
+                frames.append(DataFrame({
+                    "sku": np.repeat(skus, self.horizon),
+                    "method": label,
+                    "horizon": np.tile(np.arange(1, self.horizon + 1), len(skus)),
+                    "origins": np.tile(evaluated, len(skus)),
+                    "bias": bias.ravel(),
+                    "MAD": mad.ravel(),
+                    "MAPE": mape.ravel(),
+                }))
+        return concat(frames, ignore_index=True)
+
+    def error_table(self, label, row=0, horizon=1):
+        """
+        The backtest forecasts of one SKU row and horizon as a Month-Year / Forecast (Ft) /
+        Demand (Dt) DataFrame, ready for ForecastErrorProcessor.
+        """
+        from pandas import DataFrame
+        forecast = self.forecasts(label, slice(row, row + 1))[0, :, horizon - 1]
+        actual = self.targets(slice(row, row + 1))[0, :, horizon - 1]
+        inside = ~np.isnan(actual)
+        return DataFrame({
+            "Month-Year": self.periods[self.origins[inside] + horizon - 1],
+            "Forecast (Ft)": forecast[inside],
+            "Demand (Dt)": actual[inside],
+        })
+
+
+def main():
+    rng = np.random.default_rng(0)
+    skus, periods = 50_000, 156
+    history = rng.uniform(50, 150, (skus, 1)) + np.cumsum(rng.normal(0, 5, (skus, periods)), axis=1)
+    methods = {
+        "SMA 4": {"method": "sma", "window": 4},
+        "WMA 3": {"method": "wma", "weights": [0.2, 0.3, 0.5]},
+        "ES 0.3": {"method": "es", "alpha": 0.3},
+        "Holt 0.3/0.1": {"method": "holt", "alpha": 0.3, "beta": 0.1},
+    }
+    backtest = Backtest(history, methods, horizon=4, mode="rolling", window_length=52)
+    summary = backtest.run()
+    print(summary.groupby(["method", "horizon"])[["bias", "MAD", "MAPE"]].mean())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import math
+import struct
+from array import array
+import numpy as np
+from forecast_error_processor import _error_totals, _metrics_from_totals
+
+TOTALS = ("error", "absolute", "squared", "percentage", "demand")
+_HEADER = struct.Struct("<4sBIQQQ10dI")
+_MAGIC = b"FEAC"
+_VERSION = 1
+
+
+class ErrorAccumulator:
+    __slots__ = ("window", "count", "zero_count", "percentage_count", "_sums", "_compensations",
+                 "_errors", "_demands", "_position", "_filled", "_window_sums", "_window_percentage_count")
+
+    def __init__(self, window=None):
+        """
+        Running forecast error statistics for one SKU, updated one (forecast, demand) pair at a
+        time with the same definitions as forecast_error_metrics (Et = Dt - Ft; pairs with a
+        NaN are skipped; zero demand is left out of MAPE). Totals over all pairs use compensated
+        (Neumaier) summation, so they stay exact to rounding however many pairs are added.
+
+        With `window`, the last `window` errors and demands are also kept in a ring buffer and
+        metrics(windowed=True) reports over those periods only (a rolling MAD, for example).
+        """
+        self.window = int(window) if window else 0
+        self.count = 0
+        self.zero_count = 0
+        self.percentage_count = 0
+        self._sums = [0.0] * len(TOTALS)
+        self._compensations = [0.0] * len(TOTALS)
+        self._errors = array("d", bytes(8 * self.window))
+        self._demands = array("d", bytes(8 * self.window))
+        self._position = 0  # ring slot the next pair goes into, i.e. the oldest one once full
+        self._filled = 0
+        self._window_sums = [0.0] * len(TOTALS)
+        self._window_percentage_count = 0
+
+    @staticmethod
+    def _contributions(error, demand):
+        absolute = abs(error)
+        percentage = absolute / demand if demand != 0 else 0.0
+        return (error, absolute, error * error, percentage, demand)
+
+    def _add(self, values):
+        # Neumaier summation: the compensation collects the low-order bits each addition loses
+        for index, value in enumerate(values):
+            total = self._sums[index]
+            updated = total + value
+            if abs(total) >= abs(value):
+                self._compensations[index] += (total - updated) + value
+            else:
+                self._compensations[index] += (value - updated) + total
+            self._sums[index] = updated
+
+    def update(self, forecast, demand):
+        forecast = float(forecast)
+        demand = float(demand)
+        error = demand - forecast
+        if math.isnan(error):
+            return
+        self.count += 1
+        if demand == 0:
+            self.zero_count += 1
+        else:
+            self.percentage_count += 1
+        self._add(self._contributions(error, demand))
+        if self.window:
+            self._push(error, demand)
+
+    def update_many(self, forecast, demand, errors=None):
+        """
+        Add a whole chunk of consecutive pairs at once. The chunk is summed with NumPy and only
+        its totals go through the compensated sums, so this is the fast path for large inputs.
+        `errors` is passed on to forecast_error_metrics to receive the per-pair error columns.
+        """
+        forecast = np.asarray(forecast)
+        demand = np.asarray(demand)
+        count, zero_count, percentage_count, *totals = _error_totals(forecast, demand, errors)
+        self.count += count
+        self.zero_count += zero_count
+        self.percentage_count += percentage_count
+        self._add(totals)
+        if self.window:
+            # Only the last `window` valid pairs can still be in the window afterwards
+            error = np.subtract(demand, forecast, dtype=float)
+            valid = np.flatnonzero(~np.isnan(error))[-self.window:]
+            for value, actual in zip(error[valid].tolist(), demand[valid].astype(float).tolist()):
+                self._push(value, actual)
+
+    def _push(self, error, demand):
+        position = self._position
+        incoming = self._contributions(error, demand)
+        if self._filled == self.window:
+            outgoing = self._contributions(self._errors[position], self._demands[position])
+            self._window_sums = [total + new - old for total, new, old in zip(self._window_sums, incoming, outgoing)]
+            self._window_percentage_count -= self._demands[position] != 0
+        else:
+            self._window_sums = [total + new for total, new in zip(self._window_sums, incoming)]
+            self._filled += 1
+        self._window_percentage_count += demand != 0
+        self._errors[position] = error
+        self._demands[position] = demand
+        self._position = (position + 1) % self.window
+        if self._position == 0:
+            self._resync_window()
+
+    def _resync_window(self):
+        # Once per lap, so the add/subtract drift of the window sums cannot build up
+        columns = zip(*(self._contributions(error, demand) for error, demand in self._window_pairs()))
+        self._window_sums = [math.fsum(column) for column in columns] or [0.0] * len(TOTALS)
+
+    def _window_pairs(self):
+        # Buffered (error, demand) pairs, oldest first
+        start = self._position if self._filled == self.window else 0
+        for offset in range(self._filled):
+            slot = (start + offset) % self.window
+            yield self._errors[slot], self._demands[slot]
+
+    def merge(self, other):
+        """
+        Fold in another accumulator, e.g. one per shard. Totals are combined exactly in any
+        order; for the window, `other` is taken to cover the periods after this one's.
+        """
+        if other.window != self.window:
+            raise ValueError("Only accumulators with the same window can be merged")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.percentage_count += other.percentage_count
+        self._add(other._sums)
+        self._add(other._compensations)
+        for error, demand in other._window_pairs():
+            self._push(error, demand)
+        return self
+
+    def _totals(self):
+        return [total + compensation for total, compensation in zip(self._sums, self._compensations)]
+
+    def metrics(self, windowed=False):
+        """Every forecast_error_metrics statistic, over all pairs or over the window. O(1)."""
+        if windowed:
+            if not self.window:
+                raise ValueError("This accumulator has no window")
+            error, absolute, squared, percentage, demand = self._window_sums
+            percentage_count = self._window_percentage_count
+            return _metrics_from_totals(self._filled, self._filled - percentage_count, percentage_count,
+                                        error, absolute, squared, percentage, demand)
+        error, absolute, squared, percentage, demand = self._totals()
+        return _metrics_from_totals(self.count, self.zero_count, self.percentage_count,
+                                    error, absolute, squared, percentage, demand)
+
+    @property
+    def mad(self):
+        return self.metrics()["MAD"]
+
+    @property
+    def mape(self):
+        return self.metrics()["MAPE"]
+
+    @property
+    def bias(self):
+        return self.metrics()["Bias"]
+
+    @property
+    def rmse(self):
+        return self.metrics()["RMSE"]
+
+    @property
+    def tracking_signal(self):
+        return self.metrics()["Tracking Signal"]
+
+    def to_bytes(self):
+        """Compact binary snapshot: a fixed header plus the buffered window, oldest first."""
+        pairs = list(self._window_pairs())
+        header = _HEADER.pack(_MAGIC, _VERSION, self.window, self.count, self.zero_count, self.percentage_count,
+                              *self._sums, *self._compensations, len(pairs))
+        errors = array("d", (error for error, _ in pairs))
+        demands = array("d", (demand for _, demand in pairs))
+        return header + errors.tobytes() + demands.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        values = _HEADER.unpack_from(data)
+        magic, version, window, count, zero_count, percentage_count = values[:6]
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not an ErrorAccumulator snapshot")
+        accumulator = cls(window)
+        accumulator.count = count
+        accumulator.zero_count = zero_count
+        accumulator.percentage_count = percentage_count
+        accumulator._sums = list(values[6:11])
+        accumulator._compensations = list(values[11:16])
+        filled = values[16]
+        errors = array("d")
+        demands = array("d")
+        errors.frombytes(data[_HEADER.size:_HEADER.size + 8 * filled])
+        demands.frombytes(data[_HEADER.size + 8 * filled:_HEADER.size + 16 * filled])
+        for error, demand in zip(errors, demands):
+            accumulator._push(error, demand)
+        return accumulator
+
+
+def main():
+    import random
+    random.seed(0)
+    shards = [ErrorAccumulator(window=13) for _ in range(4)]
+    for week in range(208):
+        demand = random.choice([0, random.randint(5, 60)])
+        shards[week // 52].update(demand + random.gauss(2, 6), demand)
+    total = ErrorAccumulator.from_bytes(shards[0].to_bytes())
+    for shard in shards[1:]:
+        total.merge(shard)
+    print(f"All 208 weeks: MAD {total.mad:.2f}, MAPE {total.mape:.1%}, bias {total.bias:.1%}, "
+          f"RMSE {total.rmse:.2f}, tracking signal {total.tracking_signal:.2f}")
+    recent = total.metrics(windowed=True)
+    print(f"Last 13 weeks: MAD {recent['MAD']:.2f}, tracking signal {recent['Tracking Signal']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from pandas import DataFrame
 import pandas as pd
 import os
 from forecast_error_processor import ForecastErrorProcessor
+from forecast_error_stream import evaluate_error_file, statistics_table
+from gui_worker import GuiWorker, ProgressPanel
+from results_view import ResultsView
+
+# |Et|/Dt is a fraction of demand
+ERROR_FORMATS = {'|Et|/Dt': '{:.2%}'}
+
 
 class ForecastErrorApp:
     def __init__(self, parent):
@@ -18,50 +25,96 @@ class ForecastErrorApp:
         self.error_data_entry.grid(column=0, row=1, columnspan=4, padx=10, pady=5)
         self.error_data_entry.insert(tk.END, "Jan-2023 1000 1100\nFeb-2023 1200 1150\nMar-2023 1300 1250")  # Sample data
 
-        ttk.Button(parent, text="Calculate Forecast Errors", command=self.calculate_errors).grid(column=0, row=2, columnspan=4, padx=10, pady=5)
+        self.calculate_button = ttk.Button(parent, text="Calculate Forecast Errors", command=self.calculate_errors)
+        self.calculate_button.grid(column=0, row=2, columnspan=4, padx=10, pady=5)
         
-        self.error_result = tk.Text(parent, height=10, width=80, state='disabled')
-        self.error_result.grid(column=0, row=3, columnspan=4, padx=10, pady=5)
+        # Per-period errors and statistics, one tab each
+        self.result_tabs = ttk.Notebook(parent)
+        self.result_tabs.grid(column=0, row=3, columnspan=4, padx=10, pady=5, sticky="nsew")
+        self.errors_view = ResultsView(self.result_tabs, height=10)
+        self.statistics_view = ResultsView(self.result_tabs, height=10, filter_box=False)
+        self.result_tabs.add(self.errors_view, text="Results Table")
+        self.result_tabs.add(self.statistics_view, text="Statistics")
+        self.summary_label = ttk.Label(parent, text="")
+        self.summary_label.grid(column=0, row=7, columnspan=4, padx=10, pady=5, sticky=tk.W)
 
         self.export_button = ttk.Button(parent, text="Export to Excel", command=self.export_errors, state='disabled')
         self.export_button.grid(column=0, row=4, columnspan=4, padx=10, pady=5)
 
+        # Large CSV/Parquet files are evaluated in chunks instead of being pasted above
+        self.evaluate_button = ttk.Button(parent, text="Evaluate File...", command=self.evaluate_file)
+        self.evaluate_button.grid(column=0, row=5, columnspan=4, padx=10, pady=5)
+
+        # Calculations, file evaluation and exports run on a worker thread, reported here
+        self.progress_panel = ProgressPanel(parent)
+        self.progress_panel.grid(column=0, row=6, columnspan=4, padx=10, pady=5, sticky="ew")
+        self.worker = GuiWorker(parent, self.progress_panel)
+
     def calculate_errors(self):
         raw_data = self.error_data_entry.get("1.0", tk.END).strip()
-        rows = raw_data.split('\n')
-        data_dict = {'Month-Year (t)': [], 'Forecast (Ft)': [], 'Demand (Dt)': []}
-        
-        try:
+
+        def job(task):
+            # Parsing and the error pass both run on the worker thread
+            rows = raw_data.split('\n')
+            data_dict = {'Month-Year (t)': [], 'Forecast (Ft)': [], 'Demand (Dt)': []}
             for row in rows:
                 parts = row.split()
                 month_year, forecast, demand = parts[0], parts[1], parts[2]
                 data_dict['Month-Year (t)'].append(month_year.strip())
                 data_dict['Forecast (Ft)'].append(float(forecast.strip().replace(',', '')))
                 data_dict['Demand (Dt)'].append(float(demand.strip().replace(',', '')))
-            
-            self.df = pd.DataFrame(data_dict)
-            self.calculator = ForecastErrorProcessor(self.df)
-            results_df = self.calculator.generate_results_table()
-            
-            self.error_result.configure(state='normal')
-            self.error_result.delete(1.0, tk.END)
-            self.error_result.insert(tk.END, "Results Table:\n")
-            self.error_result.insert(tk.END, self.df.to_string(index=False))
-            self.error_result.insert(tk.END, "\n\nStatistics:\n")
-            self.error_result.insert(tk.END, results_df.to_string(index=False))
-            self.error_result.configure(state='disabled')
+            task.check_cancelled()
+
+            df = pd.DataFrame(data_dict)
+            calculator = ForecastErrorProcessor(df)
+            results_df = calculator.generate_results_table()
+            return df, calculator, calculator.error_table(), results_df
+
+        def done(result):
+            self.df, self.calculator, error_table, results_df = result
+            self.errors_view.set_data(error_table, formats=ERROR_FORMATS)
+            self.statistics_view.set_data(results_df)
+            self.result_tabs.select(self.errors_view)
+            self.summary_label.configure(text=f"{len(error_table):,} periods")
 
             self.export_button.configure(state='normal')
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+        self.worker.submit(job, on_done=done, disable=(self.calculate_button,), message="Calculating errors...")
+
+    def evaluate_file(self):
+        filetypes = [("CSV or Parquet", "*.csv *.parquet *.pq"), ("All files", "*.*")]
+        path = filedialog.askopenfilename(title="Forecast file (Forecast (Ft) and Demand (Dt) columns)", filetypes=filetypes)
+        if not path:
+            return
+        output_path = filedialog.asksaveasfilename(title="Save per-row errors to (cancel to skip)", filetypes=filetypes,
+                                                   defaultextension=os.path.splitext(path)[1])
+
+        def job(task):
+            def progress(rows):
+                # Called after every chunk, so Cancel stops the evaluation at the next chunk
+                task.check_cancelled()
+                task.report(message=f"{rows:,} rows evaluated")
+            return evaluate_error_file(path, output_path or None, progress=progress)
+
+        def done(accumulator):
+            # The per-row errors of a file stay on disk; only the statistics are shown
+            self.errors_view.clear()
+            self.statistics_view.set_data(statistics_table(accumulator))
+            self.result_tabs.select(self.statistics_view)
+            summary = f"{os.path.basename(path)}: {accumulator.count:,} rows evaluated"
+            if output_path:
+                summary += f", per-row errors written to {output_path}"
+            self.summary_label.configure(text=summary)
+
+        self.worker.submit(job, on_done=done, disable=(self.evaluate_button,), message=f"Reading {os.path.basename(path)}...")
 
     def export_errors(self):
-        try:
-            filename = os.path.join(os.path.expanduser("~"), "Downloads", "forecast_error_results.xlsx")
-            self.calculator.export_to_excel(filename)
-            messagebox.showinfo("Export Successful", f"Results exported to {filename}")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred during export: {str(e)}")
+        filename = os.path.join(os.path.expanduser("~"), "Downloads", "forecast_error_results.xlsx")
+        calculator = self.calculator
+        self.worker.submit(lambda task: calculator.export_to_excel(filename),
+                           on_done=lambda _: messagebox.showinfo("Export Successful", f"Results exported to {filename}"),
+                           on_error=lambda e: messagebox.showerror("Error", f"An error occurred during export: {str(e)}"),
+                           disable=(self.export_button,), message="Exporting to Excel...")
 
 if __name__ == "__main__":
     root = tk.Tk()
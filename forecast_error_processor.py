@@ -1,39 +1,223 @@
+import warnings
 import pandas as pd
+import numpy as np
+
+ERROR_COLUMNS = ('Forecast Error (Et)', '|Et|', '|Et|/Dt')
+METRICS = ('Average Forecast Error', 'MAD', 'MAPE', 'MSE', 'RMSE', 'Tracking Signal', 'Bias')
+PERCENT_METRICS = ('MAPE', 'Bias')
+BLOCK_SIZE = 1 << 16
+
+
+def forecast_error_metrics(forecast, demand, errors=None, block_size=BLOCK_SIZE):
+    """
+    Every forecast error statistic in one pass over 1-D forecast and demand arrays, a block of
+    `block_size` pairs at a time so the temporaries stay in cache whatever the input size.
+
+    Et = Dt - Ft. Pairs with a NaN forecast or demand are skipped. |Et|/Dt is undefined when
+    Dt = 0: such periods count towards every other statistic but are left out of MAPE and
+    reported in 'Zero Demand Periods'. Tracking Signal is the sum of errors divided by MAD and
+    Bias the sum of errors relative to total demand.
+
+    With `errors`, a dict of three preallocated arrays keyed by ERROR_COLUMNS, the per-period
+    Et, |Et| and |Et|/Dt (NaN where Dt = 0) are written there in the same pass.
+    """
+    return _metrics_from_totals(*_error_totals(forecast, demand, errors, block_size))
+
+
+def _error_totals(forecast, demand, errors=None, block_size=BLOCK_SIZE):
+    # The counts and sums every metric is derived from, in _metrics_from_totals argument order
+    forecast = np.asarray(forecast)
+    demand = np.asarray(demand)
+    count = zero_demand = percentage_count = 0
+    total_error = total_absolute = total_squared = total_percentage = total_demand = 0.0
+    for start in range(0, len(demand), block_size):
+        stop = min(start + block_size, len(demand))
+        actual = demand[start:stop]
+        error = np.subtract(actual, forecast[start:stop], dtype=float)
+        absolute = np.abs(error)
+        nonzero = actual != 0
+        percentage = np.divide(absolute, actual, out=np.full(len(error), np.nan), where=nonzero)
+        if errors is not None:
+            errors[ERROR_COLUMNS[0]][start:stop] = error
+            errors[ERROR_COLUMNS[1]][start:stop] = absolute
+            errors[ERROR_COLUMNS[2]][start:stop] = percentage
+        valid = ~np.isnan(error)
+        if not valid.all():
+            error, absolute, actual, nonzero = error[valid], absolute[valid], actual[valid], nonzero[valid]
+            percentage = percentage[valid]
+        count += len(error)
+        zero_demand += len(error) - int(np.count_nonzero(nonzero))
+        percentage_count += int(np.count_nonzero(nonzero))
+        total_error += float(error.sum())
+        total_absolute += float(absolute.sum())
+        total_squared += float(error @ error)
+        total_percentage += float(percentage[nonzero].sum())
+        total_demand += float(actual.sum(dtype=float))
+
+    return (count, zero_demand, percentage_count, total_error, total_absolute, total_squared, total_percentage,
+            total_demand)
+
+
+def _metrics_from_totals(count, zero_demand, percentage_count, total_error, total_absolute, total_squared,
+                         total_percentage, total_demand):
+    # Works on scalars (one series) and on arrays (one entry per group) alike
+    total_error = np.asarray(total_error, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mad = total_absolute / np.asarray(count, dtype=float)
+        mse = total_squared / np.asarray(count, dtype=float)
+        return {
+            'Average Forecast Error': total_error / count,
+            'MAD': mad,
+            'MAPE': total_percentage / np.asarray(percentage_count, dtype=float),
+            'MSE': mse,
+            'RMSE': np.sqrt(mse),
+            'Tracking Signal': total_error / mad,
+            'Bias': total_error / total_demand,
+            'Periods': count,
+            'Zero Demand Periods': zero_demand,
+        }
+
+
+def grouped_error_metrics(data, by, forecast='Forecast (Ft)', demand='Demand (Dt)', block_size=16 * BLOCK_SIZE):
+    """
+    The forecast_error_metrics statistics for every group of a long table, e.g. by=['SKU',
+    'Location', 'Method']. Returns one row per group: the key columns followed by METRICS,
+    'Periods' and 'Zero Demand Periods'.
+
+    The keys are factorized once into one integer group code per row. Rows are put in group
+    order with a single argsort (skipped when the table is already grouped), and every
+    sum is a np.add.reduceat over the sorted segments, a block of rows at a time. Groups are
+    never visited one by one in Python.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    codes = np.zeros(len(data), dtype=np.int64)
+    levels = []
+    for key in by:
+        key_codes, uniques = pd.factorize(data[key], use_na_sentinel=False)
+        codes = codes * len(uniques) + key_codes
+        levels.append(uniques)
+    codes, combined = pd.factorize(codes)
+    n_groups = len(combined)
+    if np.all(codes[1:] >= codes[:-1]):
+        order = None
+    else:
+        # Row order within a group does not matter for sums, so the faster unstable sort will do
+        order = np.argsort(codes.astype(np.int32) if n_groups < 2 ** 31 else codes)
+
+    forecast_values = data[forecast].to_numpy()
+    demand_values = data[demand].to_numpy()
+    totals = {name: np.zeros(n_groups, dtype=np.int64 if name.endswith('count') else float)
+              for name in ('count', 'zero_count', 'percentage_count', 'error', 'absolute', 'squared', 'percentage', 'demand')}
+    for start in range(0, len(codes), block_size):
+        rows = slice(start, start + block_size) if order is None else order[start:start + block_size]
+        group = codes[rows]
+        actual = np.asarray(demand_values[rows], dtype=float)
+        error = actual - forecast_values[rows]
+        valid = ~np.isnan(error)
+        error[~valid] = 0.0
+        actual = np.where(valid, actual, 0.0)
+        absolute = np.abs(error)
+        nonzero = valid & (actual != 0)
+        percentage = np.divide(absolute, actual, out=np.zeros(len(error)), where=nonzero)
+
+        # Segment starts inside this block; a group split across blocks just gets two partial sums
+        starts = np.flatnonzero(np.concatenate(([True], group[1:] != group[:-1])))
+        segment_groups = group[starts]
+        totals['count'][segment_groups] += np.add.reduceat(valid, starts, dtype=np.int64)
+        totals['percentage_count'][segment_groups] += np.add.reduceat(nonzero, starts, dtype=np.int64)
+        totals['error'][segment_groups] += np.add.reduceat(error, starts)
+        totals['absolute'][segment_groups] += np.add.reduceat(absolute, starts)
+        totals['squared'][segment_groups] += np.add.reduceat(error * error, starts)
+        totals['percentage'][segment_groups] += np.add.reduceat(percentage, starts)
+        totals['demand'][segment_groups] += np.add.reduceat(actual, starts)
+    totals['zero_count'] = totals['count'] - totals['percentage_count']
+
+    metrics = _metrics_from_totals(totals['count'], totals['zero_count'], totals['percentage_count'], totals['error'],
+                                   totals['absolute'], totals['squared'], totals['percentage'], totals['demand'])
+    # Split the combined codes back into one code per key, last key first
+    columns = {}
+    remainder = np.asarray(combined)
+    for key, uniques in reversed(list(zip(by, levels))):
+        remainder, key_codes = np.divmod(remainder, len(uniques))
+        columns[key] = uniques.take(key_codes)
+    result = pd.DataFrame({key: columns[key] for key in by})
+    for name in METRICS + ('Periods', 'Zero Demand Periods'):
+        result[name] = metrics[name]
+    return result
+
 
 class ForecastErrorProcessor:
-    def __init__(self, data):
+    def __init__(self, data, inplace=False):
         """
         Initialize with a DataFrame containing Month-Year, Forecast (Ft), and Demand (Dt).
+        The DataFrame is only given the error columns when inplace=True; otherwise they are
+        kept in self.errors and error_table() returns them next to the data.
         """
         self.data = data
+        self.inplace = inplace
+        self.errors = None
+        self.metrics = None
 
     def calculate_errors(self):
-        self.data['Forecast Error (Et)'] = self.data['Demand (Dt)'] - self.data['Forecast (Ft)']
-        self.data['|Et|'] = self.data['Forecast Error (Et)'].abs()
-        self.data['|Et|/Dt'] = (self.data['|Et|'] / self.data['Demand (Dt)'])
+        # Errors and statistics come out of the same pass and are kept for the later calls
+        forecast = self.data['Forecast (Ft)'].to_numpy()
+        demand = self.data['Demand (Dt)'].to_numpy()
+        self.errors = {column: np.empty(len(demand)) for column in ERROR_COLUMNS}
+        self.metrics = forecast_error_metrics(forecast, demand, errors=self.errors)
+        if self.inplace:
+            for column in ERROR_COLUMNS:
+                self.data[column] = self.errors[column]
 
     def calculate_statistics(self):
-        average_forecast_error = self.data['Forecast Error (Et)'].mean()
-        mad = self.data['|Et|'].mean()
-        mape = self.data['|Et|/Dt'].mean()
-        return average_forecast_error, mad, mape
+        if self.metrics is None:
+            self.calculate_errors()
+        return self.metrics['Average Forecast Error'], self.metrics['MAD'], self.metrics['MAPE']
+
+    def grouped_statistics(self, by):
+        """Statistics per group of the key column(s) `by`; see grouped_error_metrics."""
+        return grouped_error_metrics(self.data, by)
+
+    def error_table(self):
+        """The data with the Et, |Et| and |Et|/Dt columns, as a new DataFrame."""
+        if self.errors is None:
+            self.calculate_errors()
+        if self.inplace:
+            return self.data
+        return pd.concat([self.data.reset_index(drop=True), pd.DataFrame(self.errors)], axis=1)
+
+    @staticmethod
+    def error_statistics(forecast, demand, axis=-1):
+        """
+        Average forecast error, MAD and MAPE along `axis` for arrays of forecasts and demands
+        (broadcast against each other), with the same definitions as calculate_statistics.
+        Periods where the forecast or the demand is NaN are skipped, and periods with zero demand
+        are left out of MAPE; a statistic with no periods left is NaN.
+        """
+        errors = np.subtract(demand, forecast, dtype=float)
+        absolute = np.abs(errors)
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN slices
+            demand = np.asarray(demand)
+            percentage = np.where(demand != 0, absolute / demand, np.nan)
+            return (np.nanmean(errors, axis=axis), np.nanmean(absolute, axis=axis),
+                    np.nanmean(percentage, axis=axis))
 
     def generate_results_table(self):
-        self.calculate_errors()
-        average_forecast_error, mad, mape = self.calculate_statistics()
+        if self.metrics is None:
+            self.calculate_errors()
         results = {
-            'Parameter': ['Average Forecast Error', 'MAD', 'MAPE'],
-            'Value': [average_forecast_error, mad, mape]
+            'Parameter': list(METRICS),
+            'Value': [self.metrics[metric] for metric in METRICS]
         }
         results_df = pd.DataFrame(results)
         return results_df
 
     def export_to_excel(self, filename="forecast_error_results.xlsx"):
-        self.calculate_errors()
         results_df = self.generate_results_table()
-        
+        errors_df = self.error_table()
+
         with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
-            self.data.to_excel(writer, sheet_name='Forecast Errors', index=False)
+            errors_df.to_excel(writer, sheet_name='Forecast Errors', index=False)
             results_df.to_excel(writer, sheet_name='Statistics', index=False)
 
             workbook = writer.book
@@ -55,9 +239,9 @@ class ForecastErrorProcessor:
             # Apply formatting to the 'Statistics' sheet
             statistics_sheet.set_column('A:A', 25)  # Parameter
             statistics_sheet.set_column('B:B', 15, general_format)  # Value
-            # Specifically format MAPE as percentage
+            # Specifically format MAPE and Bias as percentages
             for row_num, param in enumerate(results_df['Parameter']):
-                if param == 'MAPE':
+                if param in PERCENT_METRICS:
                     statistics_sheet.write(row_num + 1, 1, results_df.iloc[row_num, 1], percentage_format)
                 else:
                     statistics_sheet.write(row_num + 1, 1, results_df.iloc[row_num, 1], general_format)
@@ -0,0 +1,112 @@
+import numpy as np
+from chunked_io import TableChunkWriter, iter_table_chunks, is_parquet
+from forecast_error_accumulator import ErrorAccumulator
+from forecast_error_processor import ERROR_COLUMNS, METRICS
+
+FORECAST_COLUMN = 'Forecast (Ft)'
+DEMAND_COLUMN = 'Demand (Dt)'
+
+
+def _chunks(path, chunksize, value_columns, columns=None):
+    # Forecast and demand are parsed straight to float64 by the CSV reader, with no object
+    # columns or per-value Python conversion
+    dtype = None if is_parquet(path) else {column: np.float64 for column in value_columns}
+    return iter_table_chunks(path, chunksize=chunksize, columns=columns, dtype=dtype)
+
+
+def _paired_chunks(path, actuals_path, chunksize, forecast, demand):
+    # Forecasts and actuals in two files with the same row order, read in lockstep. Chunk
+    # boundaries need not line up (Parquet batches end early at row-group boundaries), so the
+    # actuals are buffered and sliced to the length of each forecast chunk.
+    forecasts = _chunks(path, chunksize, [forecast])
+    actuals = (chunk[demand].to_numpy() for chunk in _chunks(actuals_path, chunksize, [demand], columns=[demand]))
+    pending = [np.empty(0)]
+    buffered = 0
+    for chunk in forecasts:
+        while buffered < len(chunk):
+            actual = next(actuals, None)
+            if actual is None:
+                raise ValueError("The forecast and actuals files must have the same number of rows")
+            pending.append(actual)
+            buffered += len(actual)
+        values = np.concatenate(pending) if len(pending) > 1 else pending[0]
+        chunk[demand] = values[:len(chunk)]
+        pending = [values[len(chunk):]]
+        buffered = len(pending[0])
+        yield chunk
+    if buffered or any(len(actual) for actual in actuals):
+        raise ValueError("The forecast and actuals files must have the same number of rows")
+
+
+def evaluate_error_file(path, output_path=None, forecast=FORECAST_COLUMN, demand=DEMAND_COLUMN, actuals_path=None,
+                        chunksize=100_000, window=None, quiet=True, progress=None):
+    """
+    Forecast error statistics over a CSV or Parquet file of any size, read `chunksize` rows at
+    a time. Forecasts and demand come from the `forecast` and `demand` columns of `path`, or
+    the demand from the `demand` column of a separate `actuals_path` file with the same rows.
+
+    Returns an ErrorAccumulator holding the exact totals over the whole file; its metrics()
+    give every ForecastErrorProcessor statistic (and the last `window` rows with windowed=True).
+    With output_path, each chunk is written there with the Et, |Et| and |Et|/Dt columns
+    appended as soon as it is evaluated, so memory use does not grow with the file.
+    `progress`, if given, is called with the number of rows evaluated so far after each chunk.
+    """
+    accumulator = ErrorAccumulator(window)
+    if actuals_path is None:
+        chunks = _chunks(path, chunksize, [forecast, demand])
+    else:
+        chunks = _paired_chunks(path, actuals_path, chunksize, forecast, demand)
+    writer = TableChunkWriter(output_path) if output_path is not None else None
+    rows = 0
+    try:
+        for number, chunk in enumerate(chunks, 1):
+            missing = {forecast, demand} - set(chunk.columns)
+            if missing:
+                raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}")
+            errors = {column: np.empty(len(chunk)) for column in ERROR_COLUMNS} if writer else None
+            accumulator.update_many(chunk[forecast].to_numpy(), chunk[demand].to_numpy(), errors=errors)
+            if writer:
+                for column in ERROR_COLUMNS:
+                    chunk[column] = errors[column]
+                writer.write(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+            if not quiet:
+                print(f"Processed chunk {number}: {rows} rows so far")
+    finally:
+        if writer:
+            writer.close()
+    return accumulator
+
+
+def statistics_table(accumulator, windowed=False):
+    """The Parameter / Value table of ForecastErrorProcessor.generate_results_table."""
+    from pandas import DataFrame
+    metrics = accumulator.metrics(windowed)
+    return DataFrame({'Parameter': list(METRICS), 'Value': [float(metrics[metric]) for metric in METRICS]})
+
+
+def main():
+    import os
+    import tempfile
+    from pandas import DataFrame
+    rng = np.random.default_rng(0)
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "forecasts.csv")
+    for part in range(5):
+        rows = 1_000_000
+        demand = rng.poisson(50, rows)
+        DataFrame({
+            'SKU': rng.integers(0, 10_000, rows),
+            FORECAST_COLUMN: np.round(demand + rng.normal(1, 8, rows), 2),
+            DEMAND_COLUMN: demand,
+        }).to_csv(path, mode="a", header=part == 0, index=False)
+
+    output_path = os.path.join(folder, "forecast_errors.csv")
+    accumulator = evaluate_error_file(path, output_path, chunksize=500_000, window=1000, quiet=False)
+    print(statistics_table(accumulator).to_string(index=False))
+    print(f"Per-row errors written to {output_path}")
+
+if __name__ == "__main__":
+    main()
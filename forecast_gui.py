@@ -4,6 +4,8 @@ from pandas import DataFrame, ExcelWriter
 import numpy as np
 import os
 from time_series_forecast import TimeSeriesForecast
+from forecast_tuning import ForecastTuner
+from gui_worker import GuiWorker, ProgressPanel
 
 
 class ForecastApp:
@@ -79,8 +81,16 @@ class ForecastApp:
         ttk.Button(parent, text="Calculate ES", command=self.calculate_es).grid(column=3, row=8, padx=10, pady=5)
         ttk.Button(parent, text="Export ES to Excel", command=self.export_es_to_excel).grid(column=4, row=8, padx=10, pady=5)
 
-        # Export All
-        ttk.Button(parent, text="Export All to Excel", command=self.export_all_to_excel).grid(column=0, row=9, columnspan=5, padx=10, pady=20)
+        # Parameter search and Export All
+        self.suggest_button = ttk.Button(parent, text="Suggest Parameters (lowest MAD)", command=self.suggest_parameters)
+        self.suggest_button.grid(column=0, row=9, columnspan=2, padx=10, pady=20)
+        self.export_all_button = ttk.Button(parent, text="Export All to Excel", command=self.export_all_to_excel)
+        self.export_all_button.grid(column=2, row=9, columnspan=3, padx=10, pady=20)
+
+        # The parameter search and the Excel exports run on a worker thread, reported here
+        self.progress_panel = ProgressPanel(parent)
+        self.progress_panel.grid(column=0, row=10, columnspan=5, padx=10, pady=5, sticky="ew")
+        self.worker = GuiWorker(parent, self.progress_panel)
 
     def configure_grid_weights(self, parent):
         for i in range(10):
@@ -114,6 +124,37 @@ class ForecastApp:
         self.es_result.config(text=f"Exponential Smoothing: {result:.2f}")
         self.es_result_value = result
 
+    def suggest_parameters(self):
+        # Grid search the SMA window and ES alpha on the entered history and fill in the best ones
+        data = self.get_data()
+        windows = range(2, min(len(data) - 1, 12) + 1)
+        if not windows:
+            messagebox.showerror("Not enough data", "At least three periods of data are needed to suggest parameters.")
+            return
+
+        def job(task):
+            results = ForecastTuner(windows=windows, metric="MAD").search(data)
+            # Prior forecast for the last period, so Calculate ES gives the next period's forecast
+            fitted, _ = TimeSeriesForecast(data).exponential_smoothing_series(results['es_alpha'][0])
+            return results, fitted[-1]
+
+        def done(result):
+            results, prior_forecast = result
+            self.sma_window_entry.delete(0, tk.END)
+            self.sma_window_entry.insert(0, str(results['sma_window'][0]))
+            alpha = results['es_alpha'][0]
+            self.es_alpha_entry.delete(0, tk.END)
+            self.es_alpha_entry.insert(0, f"{alpha:g}")
+            self.es_prior_entry.delete(0, tk.END)
+            self.es_prior_entry.insert(0, f"{prior_forecast:.2f}")
+            self.es_observed_entry.delete(0, tk.END)
+            self.es_observed_entry.insert(0, f"{data[-1]:g}")
+            messagebox.showinfo("Suggested Parameters",
+                                f"SMA window {results['sma_window'][0]} (MAD {results['sma_error'][0]:.2f})\n"
+                                f"ES alpha {alpha:g} (MAD {results['es_error'][0]:.2f})")
+
+        self.worker.submit(job, on_done=done, disable=(self.suggest_button,), message="Searching parameters...")
+
     def get_data(self):
         raw_data = self.data_entry.get("1.0", tk.END).strip()
         data = [float(row.split()[1].replace(',', '')) for row in raw_data.split('\n')]
@@ -161,105 +202,112 @@ class ForecastApp:
         self.export_to_excel('Exponential Smoothing', es_df, None, None, 'es_result.xlsx')
 
     def export_all_to_excel(self):
+        # Everything is read from the widgets here; the job only computes and writes
         data = self.get_data()
         dates = [row.split()[0] for row in self.data_entry.get("1.0", tk.END).strip().split('\n')]
-
-        # Calculate SMA if not already calculated
-        if self.sma_result_value is None:
-            sma_window = int(self.sma_window_entry.get())
-            ts_forecast = TimeSeriesForecast(data)
-            self.sma_result_value = ts_forecast.simple_moving_average(sma_window)
-
-        # Simple Moving Average
-        sma_df = DataFrame({'Date': dates, 'Demand (Dt)': data})
-        sma_forecast_df = DataFrame({
-            'Date': ['Next Period'],
-            'Simple Moving Average Forecast': [self.sma_result_value]
-        })
-
-        # Calculate WMA if not already calculated
-        if self.wma_result_value is None:
-            weights = self.get_weights()
-            ts_forecast = TimeSeriesForecast(data)
-            self.wma_result_value = ts_forecast.weighted_moving_average(weights)
-
-        # Weighted Moving Average
         weights = self.get_weights()
-        weights_labels = [f'w{i}' for i in range(len(weights))]
-        wma_df = DataFrame({'Date': dates, 'Demand (Dt)': data})
-        weights_df = DataFrame({'Weight #': weights_labels, 'Weight': weights})
-        wma_forecast_df = DataFrame({
-            'Date': ['Next Period'],
-            'Weighted Moving Average Forecast': [self.wma_result_value]
-        })
+        sma_window = int(self.sma_window_entry.get()) if self.sma_result_value is None else None
+        alpha = self.parse_number(self.es_alpha_entry.get())
+        prior_forecast = self.parse_number(self.es_prior_entry.get())
+        observed_demand = self.parse_number(self.es_observed_entry.get())
+        sma_result_value, wma_result_value, es_result_value = self.sma_result_value, self.wma_result_value, self.es_result_value
+        filename = os.path.join(os.path.expanduser("~"), "Downloads", "forecast_results.xlsx")
 
-        # Calculate ES if not already calculated
-        if self.es_result_value is None:
-            alpha = self.parse_number(self.es_alpha_entry.get())
-            prior_forecast = self.parse_number(self.es_prior_entry.get())
-            observed_demand = self.parse_number(self.es_observed_entry.get())
+        def job(task):
             ts_forecast = TimeSeriesForecast(data)
-            self.es_result_value = ts_forecast.exponential_smoothing(alpha, prior_forecast, observed_demand)
-
-        # Exponential Smoothing
-        es_df = DataFrame({
-            'Parameter': ['Smoothing Factor (alpha)', 'Prior Forecast', 'Observed Demand', 'Next Period Forecast'],
-            'Value': [alpha, prior_forecast, observed_demand, self.es_result_value]
-        })
-
-        with ExcelWriter(os.path.join(os.path.expanduser("~"), "Downloads", "forecast_results.xlsx"), engine='xlsxwriter') as writer:
-            # Export Simple Moving Average
-            sma_df.to_excel(writer, sheet_name='Simple Moving Average', index=False)
-            sma_forecast_df.to_excel(writer, sheet_name='Simple Moving Average', startrow=len(sma_df) + 2, index=False)
-            worksheet = writer.sheets['Simple Moving Average']
-            worksheet.set_column('A:A', 20)  # Date
-            worksheet.set_column('B:B', 20)  # Demand (Dt)
-            worksheet.set_column('C:C', 30)  # Simple Moving Average Forecast
-
-            # Export Weighted Moving Average
-            wma_df.to_excel(writer, sheet_name='Weighted Moving Average', index=False)
-            weights_df.to_excel(writer, sheet_name='Weighted Moving Average', startrow=len(wma_df) + 2, index=False)
-            wma_forecast_df.to_excel(writer, sheet_name='Weighted Moving Average', startrow=len(wma_df) + len(weights_df) + 4, index=False)
-            worksheet = writer.sheets['Weighted Moving Average']
-            worksheet.set_column('A:A', 20)  # Date
-            worksheet.set_column('B:B', 20)  # Demand (Dt)
-            worksheet.set_column('C:D', 15)  # Weights
-            worksheet.set_column('E:E', 30)  # Weighted Moving Average Forecast
-
-            # Export Exponential Smoothing
-            es_df.to_excel(writer, sheet_name='Exponential Smoothing', index=False)
-            worksheet = writer.sheets['Exponential Smoothing']
-            worksheet.set_column('A:A', 30)  # Parameter
-            worksheet.set_column('B:B', 30)  # Value
-
-        messagebox.showinfo("Export Successful", "Results exported to forecast_results.xlsx")
 
-    def export_to_excel(self, sheet_name, df1, df2, df3, filename):
-        with ExcelWriter(os.path.join(os.path.expanduser("~"), "Downloads", filename), engine='xlsxwriter') as writer:
-            df1.to_excel(writer, sheet_name=sheet_name, index=False)
-            if df2 is not None:
-                df2.to_excel(writer, sheet_name=sheet_name, startrow=len(df1) + 2, index=False)
-            if df3 is not None:
-                df3.to_excel(writer, sheet_name=sheet_name, startrow=len(df1) + len(df2) + 4, index=False)
-            
-            # Apply fixed column widths
-            worksheet = writer.sheets[sheet_name]
-            if sheet_name == 'Simple Moving Average':
+            # Calculate SMA, WMA and ES if not already calculated
+            sma = ts_forecast.simple_moving_average(sma_window) if sma_result_value is None else sma_result_value
+            wma = ts_forecast.weighted_moving_average(weights) if wma_result_value is None else wma_result_value
+            if es_result_value is None:
+                es = ts_forecast.exponential_smoothing(alpha, prior_forecast, observed_demand)
+            else:
+                es = es_result_value
+            task.check_cancelled()
+            task.report(0.3, "Writing forecast_results.xlsx...")
+
+            # Simple Moving Average
+            sma_df = DataFrame({'Date': dates, 'Demand (Dt)': data})
+            sma_forecast_df = DataFrame({
+                'Date': ['Next Period'],
+                'Simple Moving Average Forecast': [sma]
+            })
+
+            # Weighted Moving Average
+            weights_labels = [f'w{i}' for i in range(len(weights))]
+            wma_df = DataFrame({'Date': dates, 'Demand (Dt)': data})
+            weights_df = DataFrame({'Weight #': weights_labels, 'Weight': weights})
+            wma_forecast_df = DataFrame({
+                'Date': ['Next Period'],
+                'Weighted Moving Average Forecast': [wma]
+            })
+
+            # Exponential Smoothing
+            es_df = DataFrame({
+                'Parameter': ['Smoothing Factor (alpha)', 'Prior Forecast', 'Observed Demand', 'Next Period Forecast'],
+                'Value': [alpha, prior_forecast, observed_demand, es]
+            })
+
+            with ExcelWriter(filename, engine='xlsxwriter') as writer:
+                # Export Simple Moving Average
+                sma_df.to_excel(writer, sheet_name='Simple Moving Average', index=False)
+                sma_forecast_df.to_excel(writer, sheet_name='Simple Moving Average', startrow=len(sma_df) + 2, index=False)
+                worksheet = writer.sheets['Simple Moving Average']
                 worksheet.set_column('A:A', 20)  # Date
                 worksheet.set_column('B:B', 20)  # Demand (Dt)
                 worksheet.set_column('C:C', 30)  # Simple Moving Average Forecast
 
-            elif sheet_name == 'Weighted Moving Average':
+                # Export Weighted Moving Average
+                wma_df.to_excel(writer, sheet_name='Weighted Moving Average', index=False)
+                weights_df.to_excel(writer, sheet_name='Weighted Moving Average', startrow=len(wma_df) + 2, index=False)
+                wma_forecast_df.to_excel(writer, sheet_name='Weighted Moving Average', startrow=len(wma_df) + len(weights_df) + 4, index=False)
+                worksheet = writer.sheets['Weighted Moving Average']
                 worksheet.set_column('A:A', 20)  # Date
                 worksheet.set_column('B:B', 20)  # Demand (Dt)
                 worksheet.set_column('C:D', 15)  # Weights
                 worksheet.set_column('E:E', 30)  # Weighted Moving Average Forecast
 
-            elif sheet_name == 'Exponential Smoothing':
+                # Export Exponential Smoothing
+                es_df.to_excel(writer, sheet_name='Exponential Smoothing', index=False)
+                worksheet = writer.sheets['Exponential Smoothing']
                 worksheet.set_column('A:A', 30)  # Parameter
                 worksheet.set_column('B:B', 30)  # Value
-        
-        messagebox.showinfo("Export Successful", f"Results exported to {filename}")
+            return sma, wma, es
+
+        def done(results):
+            self.sma_result_value, self.wma_result_value, self.es_result_value = results
+            messagebox.showinfo("Export Successful", "Results exported to forecast_results.xlsx")
+
+        self.worker.submit(job, on_done=done, disable=(self.export_all_button,), message="Calculating forecasts...")
+
+    def export_to_excel(self, sheet_name, df1, df2, df3, filename):
+        def job(task):
+            with ExcelWriter(os.path.join(os.path.expanduser("~"), "Downloads", filename), engine='xlsxwriter') as writer:
+                df1.to_excel(writer, sheet_name=sheet_name, index=False)
+                if df2 is not None:
+                    df2.to_excel(writer, sheet_name=sheet_name, startrow=len(df1) + 2, index=False)
+                if df3 is not None:
+                    df3.to_excel(writer, sheet_name=sheet_name, startrow=len(df1) + len(df2) + 4, index=False)
+            
+                # Apply fixed column widths
+                worksheet = writer.sheets[sheet_name]
+                if sheet_name == 'Simple Moving Average':
+                    worksheet.set_column('A:A', 20)  # Date
+                    worksheet.set_column('B:B', 20)  # Demand (Dt)
+                    worksheet.set_column('C:C', 30)  # Simple Moving Average Forecast
+
+                elif sheet_name == 'Weighted Moving Average':
+                    worksheet.set_column('A:A', 20)  # Date
+                    worksheet.set_column('B:B', 20)  # Demand (Dt)
+                    worksheet.set_column('C:D', 15)  # Weights
+                    worksheet.set_column('E:E', 30)  # Weighted Moving Average Forecast
+
+                elif sheet_name == 'Exponential Smoothing':
+                    worksheet.set_column('A:A', 30)  # Parameter
+                    worksheet.set_column('B:B', 30)  # Value
+
+        self.worker.submit(job, on_done=lambda _: messagebox.showinfo("Export Successful", f"Results exported to {filename}"),
+                           message=f"Writing {filename}...")
 
 
 # Setup and run the application
@@ -0,0 +1,127 @@
+from array import array
+import numpy as np
+
+METHODS = ("sma", "wma", "es")
+
+
+class ForecastState:
+    __slots__ = ("method", "window", "weights", "alpha", "_buffer", "_position", "_count", "_total", "_level")
+
+    def __init__(self, method="sma", window=None, weights=None, alpha=None, initial=None):
+        """
+        Online SMA, WMA or ES forecaster for one SKU. Only the last `window` observations (a ring
+        buffer), their running sum and the last smoothed level are kept, so update() costs O(1)
+        for SMA and ES and O(window) for WMA however long the history grows.
+        """
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}")
+        if method == "sma" and not window:
+            raise ValueError("SMA needs a window size")
+        if method == "wma" and not weights:
+            raise ValueError("WMA needs weights")
+        if method == "es" and alpha is None:
+            raise ValueError("ES needs a smoothing factor (alpha)")
+        self.method = method
+        self.weights = array("d", weights) if method == "wma" else None
+        self.window = len(self.weights) if method == "wma" else (int(window) if method == "sma" else 0)
+        self.alpha = float(alpha) if method == "es" else None
+        self._buffer = array("d", bytes(8 * self.window))
+        self._position = 0  # slot the next observation goes into, i.e. the oldest value once full
+        self._count = 0
+        self._total = 0.0
+        self._level = None if initial is None else float(initial)
+
+    @classmethod
+    def from_history(cls, history, method="sma", window=None, weights=None, alpha=None, initial=None):
+        """Prime a state from an existing demand history."""
+        state = cls(method, window=window, weights=weights, alpha=alpha, initial=initial)
+        history = np.asarray(history, dtype=float)
+        if method == "es":
+            # The whole recursion runs vectorized; only its end state is kept
+            from time_series_forecast import TimeSeriesForecast
+            if history.size:
+                state._level = float(TimeSeriesForecast(history).exponential_smoothing_series(alpha, initial)[1])
+            state._count = history.size
+        else:
+            for demand in history[-state.window:]:
+                state.update(demand)
+            state._count = history.size
+        return state
+
+    def update(self, demand):
+        demand = float(demand)
+        if self.method == "es":
+            self._level = demand if self._level is None else self.alpha * demand + (1 - self.alpha) * self._level
+        else:
+            self._total += demand - self._buffer[self._position]
+            self._buffer[self._position] = demand
+            self._position += 1
+            if self._position == self.window:
+                self._position = 0
+                # Resync the running sum once per lap so floating-point drift cannot accumulate
+                self._total = sum(self._buffer)
+        self._count += 1
+
+    def forecast(self):
+        """Forecast for the next period."""
+        if self.method == "es":
+            if self._level is None:
+                raise ValueError("No observations or prior forecast to smooth yet.")
+            return self._level
+        if self._count < self.window:
+            raise ValueError("The length of the data must be greater than the window size.")
+        if self.method == "sma":
+            return self._total / self.window
+        # Weights run oldest to newest, and the oldest value sits at the current position
+        start = self._position
+        return sum(weight * self._buffer[(start + k) % self.window] for k, weight in enumerate(self.weights))
+
+    @property
+    def observations(self):
+        return self._count
+
+
+def dump_states(states, file):
+    """
+    Write many states sharing one method and window (and WMA weights) to `file` (a path or
+    binary file object) as one compressed .npz of stacked arrays. ES alphas may differ per SKU.
+    """
+    states = list(states)
+    if not states:
+        raise ValueError("No states to dump")
+    first = states[0]
+    for state in states:
+        if state.method != first.method or state.window != first.window or state.weights != first.weights:
+            raise ValueError("All states in one dump must share the method, window and weights")
+    np.savez_compressed(
+        file,
+        method=np.array(first.method),
+        weights=np.array(first.weights if first.weights is not None else [], dtype=float),
+        window=np.array(first.window),
+        alpha=np.array([np.nan if state.alpha is None else state.alpha for state in states]),
+        buffer=np.array([np.frombuffer(state._buffer, dtype=float) for state in states]).reshape(len(states), first.window),
+        position=np.array([state._position for state in states], dtype=np.int64),
+        count=np.array([state._count for state in states], dtype=np.int64),
+        total=np.array([state._total for state in states]),
+        level=np.array([np.nan if state._level is None else state._level for state in states]),
+    )
+
+
+def load_states(file):
+    """Read states written by dump_states, in the same order."""
+    with np.load(file, allow_pickle=False) as stored:
+        method = str(stored["method"])
+        weights = stored["weights"].tolist() or None
+        window = int(stored["window"])
+        states = []
+        for alpha, buffer, position, count, total, level in zip(stored["alpha"], stored["buffer"], stored["position"],
+                                                                  stored["count"], stored["total"], stored["level"]):
+            state = ForecastState(method, window=window or None, weights=weights,
+                                  alpha=None if np.isnan(alpha) else alpha)
+            state._buffer = array("d", buffer.tobytes())
+            state._position = int(position)
+            state._count = int(count)
+            state._total = float(total)
+            state._level = None if np.isnan(level) else float(level)
+            states.append(state)
+    return states
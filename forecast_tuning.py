@@ -0,0 +1,202 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from parallel_runner import run_sharded
+
+METHODS = ("sma", "wma", "es")
+METRICS = ("MAD", "MAPE")
+DEFAULT_WINDOWS = tuple(range(2, 13))
+DEFAULT_ALPHAS = tuple(round(alpha, 2) for alpha in np.arange(0.05, 1.0, 0.05))
+
+
+def _block_forecasts(values, cumulative, windows, weights, alphas, levels, start, stop):
+    """
+    One-step forecasts for periods start..stop-1 of every active candidate, shaped
+    (SKUs, candidates, periods), with the same definitions as the TimeSeriesForecast *_series
+    methods. `levels` holds the ES state and is advanced to the end of the block.
+    """
+    periods = np.arange(start, stop)
+    forecasts = {}
+    if windows.size:
+        # Differences of one cumulative sum give every window at every period in one gather
+        lagged = cumulative[:, periods[None, :] - windows[:, None]]
+        forecasts["sma"] = (cumulative[:, None, periods] - lagged) / windows[:, None]
+    if weights.shape[0]:
+        size = weights.shape[1]
+        windows_view = sliding_window_view(values, size, axis=-1)[:, start - size:stop - size]
+        forecasts["wma"] = np.swapaxes(windows_view @ weights.T, 1, 2)
+    if alphas.size:
+        smoothed = np.empty(levels.shape + (stop - start,))
+        for offset, period in enumerate(periods):
+            smoothed[..., offset] = levels
+            levels[...] = alphas * values[:, period, None] + (1 - alphas) * levels
+        forecasts["es"] = smoothed
+    return forecasts
+
+
+def tuning_kernel(inputs, windows, weight_sets, alphas, metric="MAD", prune_ratio=None, block=12):
+    """
+    Score every candidate of every method on each SKU row of inputs["history"] and return the
+    index and error of the best candidate per method, plus the best method overall.
+
+    All candidates are compared over the same periods: those after the longest SMA window or
+    WMA weight set. Periods are scored in blocks of `block`; with a prune_ratio, a candidate
+    whose error so far exceeds prune_ratio times the best of its method for every SKU in the
+    batch is dropped from the remaining blocks.
+
+    Pairs where the forecast or the demand is not finite (and, for MAPE, zero demand) are left
+    out: each candidate's error is the mean over its own valid pairs, so a NaN in the history,
+    which carries into every later SMA and ES forecast, cannot pass for zero error.
+    """
+    values = np.asarray(inputs["history"], dtype=float)
+    skus, periods = values.shape
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+    # Weight sets of different lengths become rows of one matrix, zero-padded on the oldest side
+    size = max((len(weights) for weights in weight_sets), default=0)
+    weights = np.zeros((len(weight_sets), size))
+    for row, weight_set in enumerate(weight_sets):
+        weights[row, size - len(weight_set):] = weight_set
+    grids = {"sma": np.asarray(windows, dtype=int), "wma": np.arange(len(weight_sets)), "es": np.asarray(alphas, dtype=float)}
+    start = max([1, size] + list(grids["sma"]))
+    if periods <= start:
+        raise ValueError("The length of the data must be greater than the longest window or weight set.")
+
+    cumulative = np.zeros((skus, periods + 1))
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+    active = {method: np.arange(len(grid)) for method, grid in grids.items()}
+    totals = {method: np.zeros((skus, len(grid))) for method, grid in grids.items()}
+    # Scored periods per candidate: a NaN in the history makes the forecasts after it NaN for
+    # some candidates only, so each one is averaged over its own valid pairs
+    counts = {method: np.zeros((skus, len(grid))) for method, grid in grids.items()}
+
+    # Run the ES recursion up to the first scored period
+    levels = np.repeat(values[:, :1], len(grids["es"]), axis=1)
+    es_alphas = grids["es"]
+    for period in range(start):
+        levels = es_alphas * values[:, period, None] + (1 - es_alphas) * levels
+
+    for block_start in range(start, periods, block):
+        block_stop = min(block_start + block, periods)
+        # levels only holds the ES state of the active alphas
+        forecasts = _block_forecasts(values, cumulative, grids["sma"][active["sma"]], weights[active["wma"]],
+                                     es_alphas[active["es"]], levels, block_start, block_stop)
+        demand = values[:, None, block_start:block_stop]
+        usable = np.isfinite(demand) & (demand != 0) if metric == "MAPE" else np.isfinite(demand)
+        for method, forecast in forecasts.items():
+            valid = usable & np.isfinite(forecast)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                error = np.abs(demand - forecast)
+                if metric == "MAPE":
+                    error = error / demand
+            totals[method][:, active[method]] += np.where(valid, error, 0.0).sum(axis=2)
+            counts[method][:, active[method]] += np.count_nonzero(valid, axis=2)
+
+        if prune_ratio is not None and block_stop < periods:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                for method in METHODS:
+                    if active[method].size <= 1:
+                        continue
+                    partial = totals[method][:, active[method]] / counts[method][:, active[method]]
+                    best = np.min(partial, axis=1, keepdims=True)
+                    keep = ~np.all(partial > prune_ratio * best, axis=0)
+                    if method == "es":
+                        levels = levels[:, keep]
+                    active[method] = active[method][keep]
+
+    results = {}
+    best_error = np.full(skus, np.inf)
+    best_method = np.full(skus, -1, dtype=np.int64)
+    for code, method in enumerate(METHODS):
+        if not len(grids[method]):
+            continue
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = np.full((skus, len(grids[method])), np.inf)
+            scores[:, active[method]] = totals[method][:, active[method]] / counts[method][:, active[method]]
+        scores[~np.isfinite(scores)] = np.inf
+        index = np.argmin(scores, axis=1)
+        error = scores[np.arange(skus), index]
+        better = error < best_error
+        best_error[better] = error[better]
+        best_method[better] = code
+        results[f"{method}_index"] = np.where(np.isfinite(error), index, -1)
+        results[f"{method}_error"] = np.where(np.isfinite(error), error, np.nan)
+    results["best_method"] = best_method
+    results["best_error"] = np.where(np.isfinite(best_error), best_error, np.nan)
+    return results
+
+
+class ForecastTuner:
+    def __init__(self, windows=DEFAULT_WINDOWS, weight_sets=(), alphas=DEFAULT_ALPHAS, metric="MAD",
+                 prune_ratio=None, block=12):
+        """
+        Grid search for the SMA window, WMA weight set and ES alpha that minimise MAD or MAPE
+        per SKU. Pass an empty grid to leave a method out. prune_ratio (e.g. 1.5) enables
+        early pruning of candidates that are clearly dominated, at the cost of exactness.
+        """
+        metric = metric.upper()
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+        if prune_ratio is not None and prune_ratio < 1:
+            raise ValueError("prune_ratio must be at least 1")
+        self.windows = tuple(int(window) for window in windows)
+        self.weight_sets = tuple(tuple(float(weight) for weight in weights) for weights in weight_sets)
+        self.alphas = tuple(float(alpha) for alpha in alphas)
+        self.metric = metric
+        self.prune_ratio = prune_ratio
+        self.block = block
+
+    def search(self, history, workers=None, shards=None):
+        """
+        Tune every SKU row of `history` (one series or a SKUs x periods matrix). With `workers`,
+        the SKU rows are split into shards and searched in a process pool.
+
+        Returns a dict of arrays with one entry per SKU: sma_window, wma_weights_index, es_alpha
+        and the error of each, plus best_method ("sma", "wma", "es" or "" if nothing could be
+        scored) and best_error.
+        """
+        values = np.asarray(history, dtype=float)
+        values = values[None, :] if values.ndim == 1 else values
+        params = {"windows": self.windows, "weight_sets": self.weight_sets, "alphas": self.alphas,
+                  "metric": self.metric, "prune_ratio": self.prune_ratio, "block": self.block}
+        if workers is None:
+            raw = tuning_kernel({"history": values}, **params)
+        else:
+            outputs = {"best_method": ((), np.int64), "best_error": ((), np.float64)}
+            for method, grid in zip(METHODS, (self.windows, self.weight_sets, self.alphas)):
+                if grid:
+                    outputs[f"{method}_index"] = ((), np.int64)
+                    outputs[f"{method}_error"] = ((), np.float64)
+            raw, _ = run_sharded(tuning_kernel, {"history": values}, outputs, params=params,
+                                 workers=workers, shards=shards)
+
+        results = {}
+        if self.windows:
+            windows = np.asarray(self.windows)
+            results["sma_window"] = np.where(raw["sma_index"] >= 0, windows[raw["sma_index"]], 0)
+            results["sma_error"] = raw["sma_error"]
+        if self.weight_sets:
+            results["wma_weights_index"] = raw["wma_index"]
+            results["wma_error"] = raw["wma_error"]
+        if self.alphas:
+            alphas = np.asarray(self.alphas)
+            results["es_alpha"] = np.where(raw["es_index"] >= 0, alphas[raw["es_index"]], np.nan)
+            results["es_error"] = raw["es_error"]
+        results["best_method"] = np.array(METHODS + ("",))[raw["best_method"]]
+        results["best_error"] = raw["best_error"]
+        return results
+
+
+def main():
+    rng = np.random.default_rng(0)
+    skus, periods = 20_000, 104
+    trend = np.linspace(0, rng.uniform(-20, 20, (skus, 1)), periods, axis=1)[..., 0]
+    history = rng.uniform(50, 150, (skus, 1)) + trend + rng.normal(0, 10, (skus, periods))
+    tuner = ForecastTuner(weight_sets=[(0.2, 0.3, 0.5), (0.1, 0.2, 0.3, 0.4)], metric="MAD", prune_ratio=1.5)
+    results = tuner.search(history, workers=2)
+    methods, counts = np.unique(results["best_method"], return_counts=True)
+    for method, count in zip(methods, counts):
+        print(f"{method}: best for {count} SKUs")
+    print(f"Median best MAD: {np.nanmedian(results['best_error']):.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, messagebox
+
+# One executor shared by every tab. NumPy, pandas and file I/O release the GIL for most of
+# their work, so jobs on these threads run alongside the Tk event loop.
+EXECUTOR_WORKERS = 2
+POLL_MS = 50
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="gui-worker")
+        return _executor
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self):
+        """
+        Handed to a running job. The job calls report() to publish progress and
+        check_cancelled() between steps; it never touches Tk widgets itself.
+        """
+        self.future = None
+        self._progress = queue.Queue()
+        self._cancel = threading.Event()
+
+    def report(self, fraction=None, message=None):
+        """Progress as a fraction in [0, 1] (None when unknown) and/or a status message."""
+        self._progress.put((fraction, message))
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def drain(self):
+        # Latest progress fraction and message queued since the last call (None if unchanged)
+        fraction = message = None
+        while True:
+            try:
+                update = self._progress.get_nowait()
+            except queue.Empty:
+                return fraction, message
+            fraction = update[0] if update[0] is not None else fraction
+            message = update[1] if update[1] is not None else message
+
+
+class ProgressPanel(ttk.Frame):
+    def __init__(self, parent, **kwargs):
+        """Progress bar, status message and Cancel button for the task a GuiWorker is running."""
+        super().__init__(parent, **kwargs)
+        self.bar = ttk.Progressbar(self, length=200, maximum=1.0)
+        self.bar.grid(row=0, column=0, padx=5, sticky="ew")
+        self.label = ttk.Label(self, text="")
+        self.label.grid(row=0, column=1, padx=5, sticky=tk.W)
+        self.cancel_button = ttk.Button(self, text="Cancel", state='disabled')
+        self.cancel_button.grid(row=0, column=2, padx=5)
+        self.grid_columnconfigure(1, weight=1)
+
+    def start(self, task, message="Working..."):
+        self.bar.configure(mode='indeterminate', value=0)
+        self.bar.start(POLL_MS)
+        self.label.configure(text=message)
+        self.cancel_button.configure(state='normal', command=task.cancel)
+
+    def update_progress(self, fraction=None, message=None):
+        if fraction is not None:
+            if str(self.bar.cget('mode')) == 'indeterminate':
+                self.bar.stop()
+                self.bar.configure(mode='determinate')
+            self.bar.configure(value=fraction)
+        if message is not None:
+            self.label.configure(text=message)
+
+    def finish(self, message=""):
+        self.bar.stop()
+        self.bar.configure(mode='determinate', value=0)
+        self.label.configure(text=message)
+        self.cancel_button.configure(state='disabled')
+
+
+class GuiWorker:
+    def __init__(self, widget, panel=None):
+        """
+        Run GUI jobs on the shared thread pool instead of the Tk main thread. `widget` is any
+        widget of the window (used for after() polling); `panel` an optional ProgressPanel.
+        """
+        self.widget = widget
+        self.panel = panel
+        self.task = None
+
+    @property
+    def busy(self):
+        return self.task is not None
+
+    def submit(self, job, on_done=None, on_error=None, on_cancel=None, on_progress=None, disable=(),
+               message="Working..."):
+        """
+        Run job(task) on a worker thread. The callbacks run on the Tk thread once it finishes:
+        on_done(result), on_error(exception) (by default an error dialog) or on_cancel() when
+        the job stopped with TaskCancelled. Progress the job reports goes to the panel and to
+        on_progress(fraction, message). Widgets in `disable` are disabled while it runs.
+        """
+        if self.busy:
+            messagebox.showinfo("Busy", "Please wait for the current calculation to finish or cancel it.")
+            return None
+        task = Task()
+        self.task = task
+        for widget in disable:
+            widget.configure(state='disabled')
+        if self.panel is not None:
+            self.panel.start(task, message)
+        task.future = shared_executor().submit(job, task)
+        callbacks = (on_done, on_error, on_cancel, on_progress, tuple(disable))
+        self.widget.after(POLL_MS, self._poll, task, callbacks)
+        return task
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    def _poll(self, task, callbacks):
+        on_done, on_error, on_cancel, on_progress, disable = callbacks
+        fraction, message = task.drain()
+        if fraction is not None or message is not None:
+            if self.panel is not None:
+                self.panel.update_progress(fraction, message)
+            if on_progress is not None:
+                on_progress(fraction, message)
+        if not task.future.done():
+            self.widget.after(POLL_MS, self._poll, task, callbacks)
+            return
+
+        self.task = None
+        for widget in disable:
+            widget.configure(state='normal')
+        error = task.future.exception()
+        if isinstance(error, TaskCancelled):
+            self._finish("Cancelled")
+            if on_cancel is not None:
+                on_cancel()
+        elif error is not None:
+            self._finish("Failed")
+            if on_error is not None:
+                on_error(error)
+            else:
+                messagebox.showerror("Error", f"An error occurred: {error}")
+        else:
+            self._finish("Done")
+            if on_done is not None:
+                on_done(task.future.result())
+
+    def _finish(self, message):
+        if self.panel is not None:
+            self.panel.finish(message)
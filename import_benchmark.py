@@ -0,0 +1,58 @@
+import os
+import re
+import subprocess
+import sys
+
+# Modules that must stay off the import path of the calculators until a feature needs them
+HEAVY_MODULES = ("matplotlib", "scipy", "pandas")
+
+# Cumulative import time allowed per module, in milliseconds (numpy alone accounts for most of it)
+IMPORT_BUDGETS_MS = {
+    "eop_calculations": 150,
+    "eop_processor": 150,
+}
+
+REPEATS = 5
+
+
+def measure_import(module, repeats=REPEATS):
+    """Best-of-`repeats` cumulative import time of `module` in a fresh interpreter, in milliseconds."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=here, capture_output=True, text=True, check=True)
+        for line in completed.stderr.splitlines():
+            match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| " + re.escape(module) + r"$", line)
+            if match:
+                elapsed = int(match.group(1)) / 1000
+                best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def loaded_heavy_modules(module):
+    """Heavy modules that importing `module` drags in."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = (f"import sys, {module}; "
+            f"print(' '.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True, check=True)
+    return completed.stdout.split()
+
+
+def main():
+    failures = []
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        elapsed = measure_import(module)
+        heavy = loaded_heavy_modules(module)
+        print(f"import {module}: {elapsed:.1f} ms (budget {budget} ms), heavy modules loaded: {heavy or 'none'}")
+        if elapsed > budget:
+            failures.append(f"{module} took {elapsed:.1f} ms to import, budget is {budget} ms")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} at load time")
+
+    for failure in failures:
+        print(f"Regression: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import math
+import numpy as np
+
+
+class IntermittentDemand:
+    def __init__(self, indptr, periods, quantities, n_periods):
+        """
+        Demand history of many SKUs in compressed sparse row form: the nonzero demand events of
+        SKU i are periods[indptr[i]:indptr[i + 1]] (increasing) with sizes
+        quantities[indptr[i]:indptr[i + 1]]. Zero-demand periods are not stored, so the Croston,
+        SBA and TSB recursions below only ever touch demand events.
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.periods = np.asarray(periods, dtype=np.int64)
+        self.quantities = np.asarray(quantities, dtype=float)
+        self.n_periods = int(n_periods)
+        self.n_skus = len(self.indptr) - 1
+
+    @classmethod
+    def from_dense(cls, demand):
+        """From a SKUs x periods demand matrix."""
+        demand = np.asarray(demand, dtype=float)
+        rows, periods = np.nonzero(demand)
+        indptr = np.zeros(demand.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=demand.shape[0]), out=indptr[1:])
+        return cls(indptr, periods, demand[rows, periods], demand.shape[1])
+
+    @classmethod
+    def from_events(cls, sku_codes, periods, quantities, n_skus, n_periods):
+        """
+        From unordered demand events (integer SKU code, period index, quantity). Events of the
+        same SKU and period are summed and zero totals dropped.
+        """
+        key = np.asarray(sku_codes, dtype=np.int64) * n_periods + np.asarray(periods, dtype=np.int64)
+        keys, inverse = np.unique(key, return_inverse=True)
+        totals = np.bincount(inverse, weights=np.asarray(quantities, dtype=float), minlength=len(keys))
+        keep = totals != 0
+        keys, totals = keys[keep], totals[keep]
+        rows = keys // n_periods
+        indptr = np.zeros(n_skus + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_skus), out=indptr[1:])
+        return cls(indptr, keys % n_periods, totals, n_periods)
+
+    def _events_by_rank(self):
+        # Yield (k, rows, event positions) for k = 0, 1, ...: the k-th event of every SKU that has
+        # more than k events. SKUs are ordered by event count, so the rows still active at step k
+        # are a prefix and the total work is proportional to the number of events.
+        counts = np.diff(self.indptr)
+        order = np.argsort(-counts, kind="stable")
+        descending = -counts[order]
+        for k in range(int(counts.max(initial=0))):
+            rows = order[:np.searchsorted(descending, -k, side="left")]
+            yield k, rows, self.indptr[rows] + k
+
+    def _smooth(self, alpha, beta=None):
+        # Shared Croston / TSB recursion. Returns the smoothed size, its smoothed second moment
+        # and either the smoothed interval (Croston) or the demand probability (TSB)
+        alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (self.n_skus,))
+        tsb = beta is not None
+        if tsb:
+            beta = np.broadcast_to(np.asarray(beta, dtype=float), (self.n_skus,))
+        size = np.zeros(self.n_skus)
+        second_moment = np.zeros(self.n_skus)
+        timing = np.zeros(self.n_skus)
+        last = np.full(self.n_skus, -1, dtype=np.int64)
+
+        for k, rows, events in self._events_by_rank():
+            quantity = self.quantities[events]
+            period = self.periods[events]
+            gap = period - last[rows]  # the first event counts from before period 0
+            if k == 0:
+                size[rows] = quantity
+                second_moment[rows] = quantity ** 2
+                timing[rows] = 1 / gap if tsb else gap
+            else:
+                a = alpha[rows]
+                size[rows] = a * quantity + (1 - a) * size[rows]
+                second_moment[rows] = a * quantity ** 2 + (1 - a) * second_moment[rows]
+                if tsb:
+                    # gap - 1 zero periods decay the probability, then the event period lifts it
+                    b = beta[rows]
+                    timing[rows] = (1 - b) ** gap * timing[rows] + b
+                else:
+                    timing[rows] = a * gap + (1 - a) * timing[rows]
+            last[rows] = period
+
+        if tsb:
+            seen = last >= 0
+            timing[seen] *= (1 - beta[seen]) ** (self.n_periods - 1 - last[seen])
+        return size, second_moment, timing
+
+    @staticmethod
+    def _rate_and_variance(probability, second_moment, rate):
+        # Demand per period is a compound Bernoulli variable: an event with `probability`, of a
+        # size with the smoothed first and second moments
+        variance = np.maximum(probability * second_moment - rate ** 2, 0.0)
+        return rate, variance
+
+    def croston(self, alpha=0.1):
+        """
+        Croston's method. alpha is a scalar or one value per SKU. Returns (demand_rate, variance)
+        per period for every SKU; SKUs without any demand get 0 for both.
+        """
+        size, second_moment, interval = self._smooth(alpha)
+        probability = np.divide(1.0, interval, out=np.zeros(self.n_skus), where=interval > 0)
+        return self._rate_and_variance(probability, second_moment, size * probability)
+
+    def sba(self, alpha=0.1):
+        """Syntetos-Boylan approximation: Croston's rate scaled by (1 - alpha / 2) to remove its bias."""
+        size, second_moment, interval = self._smooth(alpha)
+        probability = np.divide(1.0, interval, out=np.zeros(self.n_skus), where=interval > 0)
+        correction = 1 - np.asarray(alpha, dtype=float) / 2
+        return self._rate_and_variance(probability, second_moment, correction * size * probability)
+
+    def tsb(self, alpha=0.1, beta=0.1):
+        """
+        Teunter-Syntetos-Babai: the demand probability is smoothed every period (by beta), so
+        the forecast decays while a SKU sees no demand, and the size on demand events (by alpha).
+        """
+        size, second_moment, probability = self._smooth(alpha, beta)
+        return self._rate_and_variance(probability, second_moment, probability * size)
+
+
+def eoq_inputs(demand_rate, variance, days_per_period=7):
+    """
+    Convert per-period demand rates and variances into BatchEOQCalculator inputs: demand_rate
+    in units per day and standard_deviation per week, the units EOQCalculator works in.
+    Periods are assumed independent, so the variance scales with the length of time.
+    """
+    demand_rate = np.asarray(demand_rate, dtype=float)
+    variance = np.asarray(variance, dtype=float)
+    return {
+        "demand_rate": demand_rate / days_per_period,
+        "standard_deviation": np.sqrt(variance * 7 / days_per_period),
+    }
+
+
+def main():
+    rng = np.random.default_rng(0)
+    skus, periods = 200_000, 104
+    occurs = rng.random((skus, periods)) < rng.uniform(0.02, 0.3, (skus, 1))
+    sizes = rng.poisson(rng.uniform(1, 20, (skus, 1)), (skus, periods)) + 1
+    history = IntermittentDemand.from_dense(np.where(occurs, sizes, 0))
+    print(f"{len(history.periods)} demand events in {skus * periods} SKU-periods "
+          f"({len(history.periods) / (skus * periods):.1%} nonzero)")
+    for name, (rate, variance) in (("Croston", history.croston(0.1)), ("SBA", history.sba(0.1)),
+                                    ("TSB", history.tsb(0.1, 0.05))):
+        print(f"{name}: mean weekly demand {rate.mean():.2f}, mean sigma {math.sqrt(variance.mean()):.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -200,7 +200,7 @@ class EOQApp:
 
         self.error_result.delete(1.0, tk.END)
         self.error_result.insert(tk.END, "Results Table:\n")
-        self.error_result.insert(tk.END, self.df.to_string(index=False))
+        self.error_result.insert(tk.END, self.calculator.error_table().to_string(index=False))
         self.error_result.insert(tk.END, "\n\nStatistics:\n")
         self.error_result.insert(tk.END, results_df.to_string(index=False))
 
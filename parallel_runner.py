@@ -0,0 +1,177 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from eop_batch import BatchEOQCalculator, FIELDS, RESULT_FIELDS
+
+ShardTiming = namedtuple("ShardTiming", ["shard", "start", "stop", "seconds", "pid"])
+
+
+def _create_block(shape, dtype):
+    dtype = np.dtype(dtype)
+    block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+    return block, (block.name, tuple(shape), dtype.str)
+
+
+def _attach_block(spec):
+    name, shape, dtype = spec
+    try:
+        block = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track=False and registers every attached block with the resource
+        # tracker, which then unlinks or double-unregisters it; the parent owns the lifetime
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            block = shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _run_shard(kernel, params, input_specs, output_specs, shard, start, stop):
+    began = time.perf_counter()
+    blocks = []
+    inputs = {}
+    outputs = {}
+    results = None
+    try:
+        for specs, views in ((input_specs, inputs), (output_specs, outputs)):
+            for name, spec in specs.items():
+                block, views[name] = _attach_block(spec)
+                blocks.append(block)
+        results = kernel({name: view[start:stop] for name, view in inputs.items()}, **params)
+        for name, view in outputs.items():
+            view[start:stop] = results[name]
+    finally:
+        # Every view into a block has to be gone before the block can be closed
+        inputs = outputs = results = None
+        for block in blocks:
+            block.close()
+    return ShardTiming(shard, start, stop, time.perf_counter() - began, os.getpid())
+
+
+def run_sharded(kernel, inputs, outputs, params=None, workers=None, shards=None):
+    """
+    Split the rows (first axis) of `inputs` into contiguous shards and run `kernel` on each in a
+    process pool. Inputs and outputs travel through shared memory rather than being pickled; each
+    shard writes its own row range of the outputs, so results come back in input order.
+
+    kernel:  module-level function kernel(inputs, **params) -> dict of arrays for its rows.
+    inputs:  dict name -> array, all with the same number of rows.
+    outputs: dict name -> (trailing_shape, dtype) describing each kernel output per row.
+
+    Returns (outputs dict of arrays, list of ShardTiming sorted by shard).
+    """
+    params = params or {}
+    workers = workers or os.cpu_count() or 1
+    arrays = {name: np.ascontiguousarray(value) for name, value in inputs.items()}
+    rows = len(next(iter(arrays.values())))
+    shards = max(1, min(shards or workers, rows))
+    bounds = np.linspace(0, rows, shards + 1).astype(int)
+
+    blocks = []
+    try:
+        input_specs = {}
+        for name, array in arrays.items():
+            block, spec = _create_block(array.shape, array.dtype)
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            input_specs[name] = spec
+        output_specs = {}
+        for name, (trailing_shape, dtype) in outputs.items():
+            block, spec = _create_block((rows,) + tuple(trailing_shape), dtype)
+            blocks.append(block)
+            output_specs[name] = spec
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_shard, kernel, params, input_specs, output_specs, shard, start, stop)
+                       for shard, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])) if stop > start]
+            timings = sorted((future.result() for future in futures), key=lambda timing: timing.shard)
+
+        results = {}
+        for name, (block_name, shape, dtype) in output_specs.items():
+            block = next(block for block in blocks if block.name == block_name)
+            results[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf).copy()
+        return results, timings
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def eoq_kernel(inputs, **params):
+    calculator = BatchEOQCalculator(errors="coerce", **inputs, **params)
+    results = calculator.results()
+    results["error_code"] = calculator.error_codes
+    return results
+
+
+def sharded_eoq(workers=None, shards=None, **parameters):
+    """
+    BatchEOQCalculator over a process pool. Array parameters are sharded by SKU, scalar
+    parameters are sent to every worker as-is. Runs in coerce mode, so the results include
+    an error_code array. Returns (results, timings).
+    """
+    unknown = set(parameters) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown EOQ parameters: {', '.join(sorted(unknown))}")
+    inputs = {name: value for name, value in parameters.items() if value is not None and np.ndim(value) == 1}
+    params = {name: value for name, value in parameters.items() if name not in inputs}
+    if not inputs:
+        raise ValueError("At least one EOQ parameter must be an array to shard")
+    outputs = {name: ((), np.float64) for name in RESULT_FIELDS}
+    outputs["error_code"] = ((), np.uint16)
+    return run_sharded(eoq_kernel, inputs, outputs, params=params, workers=workers, shards=shards)
+
+
+def forecast_kernel(inputs, method, window=None, weights=None):
+    # Next-period forecast for every SKU row, with the same tail semantics as TimeSeriesForecast
+    history = inputs["history"]
+    if method == "sma":
+        forecast = history[:, -window:].mean(axis=1)
+    elif method == "wma":
+        forecast = history[:, -len(weights):] @ np.asarray(weights, dtype=float)
+    else:
+        raise ValueError(f"Unknown forecast method: {method}")
+    return {"forecast": forecast}
+
+
+def sharded_forecast(history, method="sma", window=None, weights=None, workers=None, shards=None):
+    """
+    Next-period SMA or WMA forecast for every row of a SKU x period matrix, sharded across
+    processes. Returns (forecast array, timings).
+    """
+    history = np.asarray(history, dtype=float)
+    if method == "sma" and (window is None or history.shape[1] < window):
+        raise ValueError("The length of the data must be greater than the window size.")
+    if method == "wma" and (weights is None or history.shape[1] < len(weights)):
+        raise ValueError("The length of the weights must be equal to the length of the data window.")
+    results, timings = run_sharded(forecast_kernel, {"history": history}, {"forecast": ((), np.float64)},
+                                   params={"method": method, "window": window, "weights": weights},
+                                   workers=workers, shards=shards)
+    return results["forecast"], timings
+
+
+def main():
+    rng = np.random.default_rng(0)
+    skus = 2_000_000
+    results, timings = sharded_eoq(
+        demand_rate=rng.uniform(1, 50, skus),
+        purchase_cost=rng.uniform(1, 100, skus),
+        holding_cost_rate=0.28,
+        ordering_cost=rng.uniform(20, 80, skus),
+        standard_deviation_per_day=rng.uniform(1, 10, skus),
+        lead_time_days=rng.integers(1, 30, skus).astype(float),
+        service_level=0.95,
+        days_per_year=312,
+    )
+    for timing in timings:
+        print(f"Shard {timing.shard}: rows {timing.start}-{timing.stop} in {timing.seconds:.2f}s (pid {timing.pid})")
+    print(f"EOQ computed for {len(results['EOQ'])} SKUs")
+
+if __name__ == "__main__":
+    main()
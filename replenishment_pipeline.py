@@ -0,0 +1,147 @@
+import numpy as np
+from eop_batch import BatchEOQCalculator, FIELDS
+from forecast_error_processor import ForecastErrorProcessor
+from time_series_forecast import TimeSeriesForecast
+
+# For normally distributed forecast errors the standard deviation is about 1.25 times the MAD
+MAD_TO_SIGMA = 1.25
+FORECAST_METHODS = ("sma", "wma", "es", "holt")
+
+
+def history_chunks(history, sku_ids=None, chunksize=100_000):
+    """
+    Source stage: yield {"sku_ids", "history"} chunks of at most `chunksize` SKU rows from a
+    SKUs x periods array (e.g. a DemandStore matrix, whose row slices are read in place).
+    """
+    sku_ids = np.arange(len(history)) if sku_ids is None else np.asarray(sku_ids)
+    for start in range(0, len(history), chunksize):
+        yield {"sku_ids": sku_ids[start:start + chunksize], "history": history[start:start + chunksize]}
+
+
+def store_chunks(store, chunksize=100_000, periods=slice(None)):
+    """Source stage over a DemandStore."""
+    for rows, block in store.iter_blocks(chunksize, periods=periods):
+        yield {"sku_ids": store.sku_ids[rows], "history": block}
+
+
+def forecast_stage(chunks, method="es", window=None, weights=None, alpha=None, beta=None):
+    """
+    Add the next-period forecast and the one-step forecasts over the history ("fitted") to
+    each chunk, using the TimeSeriesForecast series methods.
+    """
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"method must be one of {', '.join(FORECAST_METHODS)}")
+    for chunk in chunks:
+        series = TimeSeriesForecast(chunk["history"])
+        values = series.values
+        if method == "sma":
+            fitted = series.simple_moving_average_series(window)
+            forecast = values[:, -window:].mean(axis=1)
+        elif method == "wma":
+            fitted = series.weighted_moving_average_series(weights)
+            forecast = values[:, -len(weights):] @ np.asarray(weights, dtype=float)
+        elif method == "es":
+            fitted, forecast = series.exponential_smoothing_series(alpha)
+            fitted[:, 0] = np.nan  # the first "forecast" is the first observation itself
+        else:
+            fitted, forecast = series.holt_series(alpha, beta)
+            forecast = forecast[:, 0]
+        chunk["fitted"] = fitted
+        chunk["forecast"] = forecast
+        yield chunk
+
+
+def error_stage(chunks, periods=None):
+    """
+    Add each SKU's MAD of the one-step forecasts (over the last `periods` periods, or all
+    that have a forecast) and the demand sigma per period estimated as 1.25 * MAD. The fitted
+    series is dropped afterwards so it does not travel further down the pipeline.
+    """
+    for chunk in chunks:
+        fitted = chunk.pop("fitted")
+        history = chunk["history"]
+        if periods is not None:
+            fitted, history = fitted[:, -periods:], history[:, -periods:]
+        _, mad, _ = ForecastErrorProcessor.error_statistics(fitted, history)
+        chunk["mad"] = mad
+        chunk["sigma"] = MAD_TO_SIGMA * mad
+        yield chunk
+
+
+def eoq_stage(chunks, days_per_period=7, attributes=None, **defaults):
+    """
+    Run BatchEOQCalculator (coerce mode) on each chunk and yield its results DataFrame with
+    sku_id, forecast and mad columns in front.
+
+    Forecasts are per period, so demand_rate (per day) is forecast / days_per_period and the
+    weekly standard_deviation EOQCalculator expects is sigma * sqrt(7 / days_per_period).
+    `attributes` is an optional DataFrame indexed by SKU id with per-SKU EOQ parameters
+    (purchase_cost, ordering_cost, lead_time_days, service_level, ...); `defaults` fills the
+    parameters it does not carry.
+    """
+    unknown = set(defaults) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown EOQ parameters: {', '.join(sorted(unknown))}")
+    for chunk in chunks:
+        params = dict(defaults)
+        if attributes is not None:
+            rows = attributes.reindex(chunk["sku_ids"])
+            for name in FIELDS:
+                if name in rows.columns:
+                    params[name] = rows[name].to_numpy(dtype=float, na_value=np.nan)
+        params["demand_rate"] = chunk["forecast"] / days_per_period
+        params["standard_deviation"] = chunk["sigma"] * np.sqrt(7 / days_per_period)
+        results = BatchEOQCalculator(errors="coerce", **params).to_dataframe()
+        results.insert(0, "sku_id", chunk["sku_ids"])
+        results.insert(1, "forecast", chunk["forecast"])
+        results.insert(2, "mad", chunk["mad"])
+        yield results
+
+
+def run_replenishment(history, sku_ids=None, output_path=None, chunksize=100_000, method="es", window=None,
+                      weights=None, alpha=0.3, beta=0.1, error_periods=None, days_per_period=7, attributes=None,
+                      quiet=False, **defaults):
+    """
+    Forecast -> forecast error -> EOQ, safety stock and ROP for every SKU row of `history` (a
+    SKUs x periods array, or a DemandStore), one chunk at a time. The stages are generators,
+    so only one chunk is in memory at any point.
+
+    With output_path (CSV or Parquet) the results are written as they are produced and a
+    summary dict is returned; without it the results are concatenated into one DataFrame.
+    """
+    if hasattr(history, "iter_blocks"):
+        chunks = store_chunks(history, chunksize)
+    else:
+        chunks = history_chunks(history, sku_ids, chunksize)
+    chunks = forecast_stage(chunks, method, window=window, weights=weights, alpha=alpha, beta=beta)
+    chunks = error_stage(chunks, error_periods)
+    results = eoq_stage(chunks, days_per_period, attributes, **defaults)
+
+    if output_path is None:
+        from pandas import concat
+        return concat(results, ignore_index=True)
+
+    from chunked_io import TableChunkWriter
+    summary = {"chunks": 0, "rows": 0, "rows_with_errors": 0}
+    with TableChunkWriter(output_path) as writer:
+        for frame in results:
+            writer.write(frame)
+            summary["chunks"] += 1
+            summary["rows"] += len(frame)
+            summary["rows_with_errors"] += int(np.count_nonzero(frame["error_code"]))
+            if not quiet:
+                print(f"Processed chunk {summary['chunks']}: {summary['rows']} rows so far")
+    return summary
+
+
+def main():
+    rng = np.random.default_rng(0)
+    skus, weeks = 200_000, 104
+    history = rng.poisson(rng.uniform(5, 200, (skus, 1)), (skus, weeks)).astype(float)
+    results = run_replenishment(history, method="es", alpha=0.2, chunksize=50_000, purchase_cost=12.0,
+                                holding_cost_rate=0.25, ordering_cost=40.0, lead_time_days=14, service_level=0.95,
+                                days_per_year=364)
+    print(results[["sku_id", "forecast", "mad", "EOQ", "safety_stock", "rop"]].head())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+ALL_COLUMNS = "All columns"
+DEFAULT_ROW_HEIGHT = 20  # ttk.Treeview row height in pixels when the theme does not set one
+FILTER_DELAY_MS = 250
+
+
+def format_value(value, template=None):
+    if value is None or (isinstance(value, (float, np.floating)) and math.isnan(value)):
+        return ""
+    if template is not None:
+        try:
+            return template.format(value)
+        except (TypeError, ValueError):
+            return str(value)
+    if isinstance(value, (float, np.floating)):
+        return f"{value:,.6g}"
+    return str(value)
+
+
+class ResultsView(ttk.Frame):
+    def __init__(self, parent, height=10, filter_box=True, **kwargs):
+        """
+        Table view for results of any length. Only the rows that fit in the window exist as
+        Treeview items; scrolling refills them from the backing column arrays, so showing a
+        50k-row table costs the same as showing ten rows. Clicking a heading sorts by that
+        column and the filter box keeps the rows containing the text; both only replace the
+        array of row numbers being shown, never the widget.
+        """
+        super().__init__(parent, **kwargs)
+        self.visible_rows = height
+        self.data = None
+        self.formats = {}
+        self._values = []
+        self._templates = []
+        self.index = np.arange(0)  # rows of `data` in display order, after sorting and filtering
+        self.top = 0
+        self._order = None  # full sort permutation, or None for the original order
+        self._sorted_by = None
+        self._descending = False
+        self._mask = None
+        self._strings = {}  # formatted text per column, built the first time a filter needs it
+        self._filter_job = None
+        self._slots = 0  # Treeview items currently created, attached or detached
+
+        row = 0
+        if filter_box:
+            filter_frame = ttk.Frame(self)
+            filter_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+            ttk.Label(filter_frame, text="Filter:").grid(row=0, column=0, padx=(0, 5))
+            self.filter_entry = ttk.Entry(filter_frame, width=30)
+            self.filter_entry.grid(row=0, column=1, sticky="ew")
+            self.filter_entry.bind("<KeyRelease>", self._schedule_filter)
+            self.filter_column = ttk.Combobox(filter_frame, values=[ALL_COLUMNS], state='readonly', width=20)
+            self.filter_column.set(ALL_COLUMNS)
+            self.filter_column.grid(row=0, column=2, padx=5)
+            self.filter_column.bind("<<ComboboxSelected>>", self._schedule_filter)
+            self.count_label = ttk.Label(filter_frame, text="")
+            self.count_label.grid(row=0, column=3, padx=5)
+            filter_frame.grid_columnconfigure(1, weight=1)
+            row = 1
+        else:
+            self.filter_entry = self.filter_column = self.count_label = None
+
+        self.tree = ttk.Treeview(self, show='headings', height=height, selectmode='browse')
+        self.tree.grid(row=row, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=row, column=1, sticky="ns")
+        self.grid_rowconfigure(row, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.top - 3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.top + 3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_to(self.top - self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.scroll_to(self.top + self.visible_rows))
+        self._create_items()
+
+    def set_data(self, data, formats=None):
+        """
+        Show a DataFrame (or a dict of equal-length columns). `formats` maps column names to
+        str.format templates, e.g. {'|Et|/Dt': '{:.2%}'}. Only references to the columns are
+        kept; nothing is formatted until it is on screen.
+        """
+        from pandas import DataFrame
+        data = data if isinstance(data, DataFrame) else DataFrame(data)
+        self.data = data.reset_index(drop=True)
+        self.formats = dict(formats or {})
+        self._values = [self.data[column].to_numpy() for column in self.data.columns]
+        self._templates = [self.formats.get(column) for column in self.data.columns]
+        self._strings = {}
+        self._order = None
+        self._sorted_by = None
+        self._mask = None
+
+        columns = [str(column) for column in self.data.columns]
+        self.tree.configure(columns=columns)
+        for position, column in enumerate(columns):
+            self.tree.heading(column, text=column, command=lambda position=position: self.sort(position))
+            self.tree.column(column, width=max(80, 8 * len(column)), stretch=True,
+                             anchor=tk.E if self.data.dtypes.iloc[position].kind in "iuf" else tk.W)
+        if self.filter_column is not None:
+            self.filter_column.configure(values=[ALL_COLUMNS] + columns)
+            self.filter_column.set(ALL_COLUMNS)
+            self.filter_entry.delete(0, tk.END)
+        self._update_index()
+
+    def clear(self):
+        self.set_data({})
+
+    def sort(self, position, descending=None):
+        """Sort by the column at `position`; clicking the same heading again reverses the order."""
+        if self.data is None or not len(self._values):
+            return
+        if descending is None:
+            descending = not self._descending if self._sorted_by == position else False
+        from pandas import Series
+        # Stable, so ties stay in their original order; missing values go last either way
+        keys = Series(self._values[position])
+        self._order = keys.sort_values(ascending=not descending, kind='stable', na_position='last').index.to_numpy()
+        self._sorted_by, self._descending = position, descending
+        for other, column in enumerate(self.tree["columns"]):
+            arrow = (" ▼" if descending else " ▲") if other == position else ""
+            self.tree.heading(column, text=column + arrow)
+        self._update_index(keep_position=True)
+
+    def filter(self, text, column=None):
+        """Keep the rows whose displayed text in `column` (or in any column) contains `text`."""
+        text = text.strip().lower()
+        if not text or self.data is None:
+            self._mask = None
+        else:
+            positions = range(len(self._values)) if column is None else [[str(name) for name in self.data.columns].index(column)]
+            mask = np.zeros(len(self.data), dtype=bool)
+            for position in positions:
+                mask |= self._column_strings(position).str.contains(text, regex=False).to_numpy()
+            self._mask = mask
+        self._update_index()
+
+    def _column_strings(self, position):
+        if position not in self._strings:
+            from pandas import Series
+            template = self._templates[position]
+            self._strings[position] = Series([format_value(value, template) for value in self._values[position]]).str.lower()
+        return self._strings[position]
+
+    def _schedule_filter(self, event=None):
+        # Wait for a pause in typing so a large table is not filtered on every keystroke
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._apply_filter_box)
+
+    def _apply_filter_box(self):
+        self._filter_job = None
+        column = self.filter_column.get()
+        self.filter(self.filter_entry.get(), None if column == ALL_COLUMNS else column)
+
+    def _update_index(self, keep_position=False):
+        n_rows = 0 if self.data is None else len(self.data)
+        index = np.arange(n_rows) if self._order is None else self._order
+        if self._mask is not None:
+            index = index[self._mask[index]]
+        self.index = index
+        if self.count_label is not None:
+            self.count_label.configure(text=f"{len(index):,} of {n_rows:,} rows")
+        self.scroll_to(self.top if keep_position else 0)
+
+    def _create_items(self):
+        # get_children() misses detached items, so every slot id is deleted explicitly
+        self.tree.delete(*[iid for iid in map(str, range(self._slots)) if self.tree.exists(iid)])
+        self._slots = self.visible_rows
+        for slot in range(self.visible_rows):
+            self.tree.insert("", tk.END, iid=str(slot))
+
+    def scroll_to(self, top):
+        """Show the rows from display position `top` on, refilling the existing items."""
+        self.top = int(max(0, min(top, len(self.index) - self.visible_rows)))
+        rows = self.index[self.top:self.top + self.visible_rows]
+        for slot in range(self.visible_rows):
+            iid = str(slot)
+            if slot < len(rows):
+                row = rows[slot]
+                values = [format_value(column[row], template) for column, template in zip(self._values, self._templates)]
+                self.tree.item(iid, values=values)
+                self.tree.move(iid, "", slot)  # reattaches it if it was detached
+            else:
+                self.tree.detach(iid)
+        total = max(len(self.index), 1)
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_rows) / total))
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * len(self.index)))
+        elif unit == "pages":
+            self.scroll_to(self.top + int(amount) * self.visible_rows)
+        else:
+            self.scroll_to(self.top + int(amount))
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_to(self.top - 3 * step)
+
+    def _row_metrics(self):
+        # (heading height, row height) in pixels, measured on the first row while it is on
+        # screen, so fonts, themes and DPI scaling are all taken into account
+        children = self.tree.get_children()
+        box = self.tree.bbox(children[0]) if children else ""
+        if box:
+            return box[1], box[3]
+        try:
+            row_height = int(float(ttk.Style(self).lookup("Treeview", "rowheight")))
+        except (TypeError, ValueError):
+            row_height = DEFAULT_ROW_HEIGHT
+        return row_height, row_height
+
+    def _on_resize(self, event):
+        # Only the number of items follows the allocated size; the tree's requested height is
+        # left alone, so this handler cannot make the layout grow and fire it again
+        heading, row_height = self._row_metrics()
+        rows = max(1, (event.height - heading) // max(row_height, 1))
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._create_items()
+            self.scroll_to(self.top)
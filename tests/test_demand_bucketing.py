@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from demand_bucketing import DemandBucketer
+
+
+def test_sku_column_typed_differently_per_chunk(tmp_path):
+    # The first chunk only holds numeric-looking ids, so pandas would infer int64 for it and
+    # str for the second; "0042" must still be one SKU
+    path = tmp_path / "transactions.csv"
+    pd.DataFrame({
+        "timestamp": ["2024-01-01", "2024-01-02", "2024-01-08", "2024-01-09"],
+        "sku": ["0042", "7", "0042", "A-1"],
+        "qty": [1, 2, 3, 4],
+    }).to_csv(path, index=False)
+
+    bucketer = DemandBucketer("W").ingest(path, chunksize=2)
+    assert bucketer.sku_ids == ["0042", "7", "A-1"]
+    assert all(type(sku) is str for sku in bucketer.sku_ids)
+    np.testing.assert_array_equal(bucketer.demand, [[1, 3], [2, 0], [0, 4]])
+
+
+def test_non_string_ids_are_normalised():
+    bucketer = DemandBucketer("D")
+    day = np.datetime64("2024-01-01")
+    bucketer.add([day], np.array([42]), [1.0])
+    bucketer.add([day], np.array(["42"]), [2.0])
+    assert bucketer.sku_ids == ["42"]
+    np.testing.assert_array_equal(bucketer.demand, [[3.0]])
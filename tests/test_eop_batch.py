@@ -0,0 +1,21 @@
+import warnings
+import numpy as np
+from eop_batch import BatchEOQCalculator, round_half_even
+
+
+def test_round_half_even_passes_non_finite_values_through_silently():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rounded = round_half_even(np.array([np.inf, -np.inf, np.nan, 0.25, 1.05]))
+    assert np.isposinf(rounded[0]) and np.isneginf(rounded[1]) and np.isnan(rounded[2])
+    assert rounded[3] == round(0.25, 1) and rounded[4] == round(1.05, 1)
+
+
+def test_calculate_rop_with_extreme_service_levels_emits_no_warnings():
+    calculator = BatchEOQCalculator(demand_rate=np.array([10.0, 10.0, 10.0]), purchase_cost=5, holding_cost_rate=0.2,
+                                    ordering_cost=50, standard_deviation=4, lead_time=2,
+                                    service_level=np.array([0.0, 0.95, 1.0]), errors="coerce")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rop = calculator.calculate_rop()
+    assert np.isfinite(rop[1])
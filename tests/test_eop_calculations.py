@@ -0,0 +1,41 @@
+import pytest
+from eop_calculations import EOQCalculator
+
+
+def make_calculator():
+    return EOQCalculator(demand_rate=10, purchase_cost=5, holding_cost_rate=0.2, ordering_cost=50,
+                         standard_deviation=4, lead_time=2, service_level=0.95)
+
+
+def test_attribute_write_is_picked_up_by_update_calculations():
+    calc = make_calculator()
+    calc.demand_rate = 20
+    calc.update_calculations()
+
+    expected = make_calculator()
+    expected.set_parameters(demand_rate=20)
+    assert calc.demand_rate == 20
+    assert calc.D == 20 * 365
+    assert calc.EOQ == pytest.approx(expected.EOQ)
+    assert calc.EOQ != pytest.approx(make_calculator().EOQ)
+
+
+def test_attribute_write_survives_set_parameters():
+    calc = make_calculator()
+    calc.ordering_cost = 100
+    calc.set_parameters(service_level=0.99)
+
+    expected = make_calculator()
+    expected.set_parameters(ordering_cost=100, service_level=0.99)
+    assert calc.ordering_cost == 100
+    assert calc.EOQ == pytest.approx(expected.EOQ)
+    assert calc.z == pytest.approx(expected.z)
+
+
+def test_derived_values_are_not_taken_as_inputs():
+    calc = EOQCalculator(demand_yearly=3650, purchase_cost=5, holding_cost_rate=0.2, ordering_cost=50)
+    calc.set_parameters(demand_yearly=7300)
+    assert calc.demand_rate == pytest.approx(20)
+    calc.update_calculations()
+    calc.set_parameters(days_per_year=730)
+    assert calc.demand_rate == pytest.approx(10)
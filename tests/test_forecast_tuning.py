@@ -0,0 +1,46 @@
+import numpy as np
+from forecast_tuning import tuning_kernel
+from time_series_forecast import TimeSeriesForecast
+
+
+def reference_errors(history, windows, alphas, start, metric="MAD"):
+    # Brute force: full-history series from TimeSeriesForecast, scored with nanmean
+    series = TimeSeriesForecast(history)
+    demand = history[:, start:]
+
+    def score(fitted):
+        error = np.abs(demand - fitted[:, start:])
+        if metric == "MAPE":
+            error = np.where(demand != 0, error / demand, np.nan)
+        return np.nanmean(error, axis=1)
+
+    sma = np.stack([score(series.simple_moving_average_series(window)) for window in windows], axis=1)
+    es = np.stack([score(series.exponential_smoothing_series(alpha)[0]) for alpha in alphas], axis=1)
+    return sma, es
+
+
+def test_nan_history_is_not_scored_as_zero_error():
+    rng = np.random.default_rng(0)
+    history = rng.normal(100, 30, (3, 40))
+    history[0, 10] = np.nan
+    windows, alphas = (2, 4), (0.2, 0.5)
+    results = tuning_kernel({"history": history}, windows, (), alphas, block=5)
+
+    # Every SMA and ES forecast of row 0 after period 10 is NaN; only the periods before it count
+    sma, es = reference_errors(history, windows, alphas, start=max(windows))
+    np.testing.assert_allclose(results["sma_error"], sma.min(axis=1))
+    np.testing.assert_allclose(results["es_error"], es.min(axis=1))
+    np.testing.assert_array_equal(results["sma_index"], sma.argmin(axis=1))
+    np.testing.assert_array_equal(results["es_index"], es.argmin(axis=1))
+
+
+def test_nan_demand_only_skips_that_period():
+    rng = np.random.default_rng(1)
+    history = rng.normal(100, 30, (2, 30))
+    history[:, -1] = np.nan  # the last period has no forecast after it, so nothing else turns NaN
+    windows, alphas = (3,), (0.3,)
+    results = tuning_kernel({"history": history}, windows, (), alphas, metric="MAPE", block=4)
+
+    sma, es = reference_errors(history, windows, alphas, start=3, metric="MAPE")
+    np.testing.assert_allclose(results["sma_error"], sma[:, 0])
+    np.testing.assert_allclose(results["es_error"], es[:, 0])
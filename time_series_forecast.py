@@ -1,19 +1,198 @@
-import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 class TimeSeriesForecast:
+    # Above this many distinct alphas, exponential_smoothing_series steps SKUs in lockstep instead
+    MAX_FILTER_GROUPS = 64
+
     def __init__(self, data):
-        self.data = pd.Series(data)
-    
+        """
+        Initialize with one demand history, or with a SKUs x periods matrix for the *_series
+        methods, which work along the last axis.
+        """
+        values = np.asarray(data)
+        # Floating arrays (e.g. float32 views of a DemandStore memory map) are used in place
+        self.values = values if values.dtype.kind == "f" else values.astype(float)
+        self._data = None
+
+    @property
+    def data(self):
+        # Built on first use only; the forecasts below read the tail of self.values directly
+        if self._data is None and self.values.ndim == 1:
+            from pandas import Series
+            self._data = Series(self.values)
+        return self._data
+
     def simple_moving_average(self, window):
-        if len(self.data) < window:
+        if len(self.values) < window:
             raise ValueError("The length of the data must be greater than the window size.")
-        return self.data[-window:].mean()
+        return self.values[-window:].mean()
 
     def weighted_moving_average(self, weights):
-        if len(weights) != len(self.data[-len(weights):]):
+        if len(weights) != len(self.values[-len(weights):]):
             raise ValueError("The length of the weights must be equal to the length of the data window.")
-        return np.dot(self.data[-len(weights):], weights)
+        return np.dot(self.values[-len(weights):], weights)
 
     def exponential_smoothing(self, alpha, prior_forecast, observed_demand):
-        return alpha * observed_demand + (1 - alpha) * prior_forecast
\ No newline at end of file
+        return alpha * observed_demand + (1 - alpha) * prior_forecast
+
+    def simple_moving_average_series(self, window):
+        """
+        One-step-ahead SMA forecast for every period: entry t is the mean of the `window` periods
+        before t, NaN where fewer than `window` periods exist. Uses one cumulative sum, so the
+        cost is O(n) whatever the window.
+        """
+        periods = self.values.shape[-1]
+        if periods < window:
+            raise ValueError("The length of the data must be greater than the window size.")
+        totals = np.zeros(self.values.shape[:-1] + (periods + 1,))
+        np.cumsum(self.values, axis=-1, dtype=float, out=totals[..., 1:])
+        forecast = np.full(self.values.shape, np.nan)
+        forecast[..., window:] = (totals[..., window:periods] - totals[..., :periods - window]) / window
+        return forecast
+
+    def weighted_moving_average_series(self, weights):
+        """
+        One-step-ahead WMA forecast for every period, weights applied oldest to newest as in
+        weighted_moving_average; NaN where fewer than len(weights) periods exist. All windows are
+        evaluated in a single pass as a strided view multiplied by the weight vector.
+        """
+        weights = np.asarray(weights, dtype=float)
+        size = len(weights)
+        if self.values.shape[-1] < size:
+            raise ValueError("The length of the weights must be equal to the length of the data window.")
+        windows = sliding_window_view(self.values, size, axis=-1)
+        forecast = np.full(self.values.shape, np.nan)
+        forecast[..., size:] = windows[..., :-1, :] @ weights
+        return forecast
+
+    def exponential_smoothing_series(self, alpha, initial=None):
+        """
+        Run the exponential smoothing recursion F(t+1) = alpha * D(t) + (1 - alpha) * F(t) over the
+        whole history. `alpha` is a scalar or one value per SKU row; `initial` is the forecast for
+        the first period (defaults to the first observation).
+
+        Returns (fitted, next_forecast): fitted[..., t] is the forecast made for period t and
+        next_forecast the forecast for the period after the history.
+
+        Up to MAX_FILTER_GROUPS distinct alphas each run as one linear filter over their rows.
+        With more (e.g. a tuned alpha per SKU) the recursion is stepped period by period instead,
+        vectorised across all rows, which is linear in the history length as well.
+        """
+        values = self.values
+        batch_shape = values.shape[:-1]
+        alpha = np.broadcast_to(np.asarray(alpha, dtype=float), batch_shape)
+        if not np.all((alpha > 0) & (alpha <= 1)):
+            raise ValueError("alpha must be greater than 0 and at most 1")
+        initial = values[..., 0] if initial is None else np.broadcast_to(np.asarray(initial, dtype=float), batch_shape)
+        smoothed = np.empty(values.shape)
+
+        levels = np.unique(alpha)
+        if levels.size <= self.MAX_FILTER_GROUPS:
+            # Each smoothing constant is one first-order IIR filter applied to all its rows at once
+            from scipy.signal import lfilter
+            for level in levels:
+                rows = alpha == level
+                smoothed[rows] = lfilter([level], [1.0, -(1 - level)], values[rows], axis=-1,
+                                         zi=((1 - level) * initial[rows])[..., None])[0]
+        else:
+            # Too many distinct constants to filter group by group: step all rows in lockstep
+            level = np.array(initial, dtype=float)
+            for period in range(values.shape[-1]):
+                level = alpha * values[..., period] + (1 - alpha) * level
+                smoothed[..., period] = level
+
+        fitted = np.concatenate([np.asarray(initial, dtype=float)[..., None], smoothed[..., :-1]], axis=-1)
+        return fitted, smoothed[..., -1]
+
+    def _smoothing_parameters(self, *parameters):
+        batch_shape = self.values.shape[:-1]
+        return [np.broadcast_to(np.asarray(parameter, dtype=float), batch_shape) for parameter in parameters]
+
+    def holt_states(self, alpha, beta, initial_level=None, initial_trend=None):
+        """
+        Level and trend of double (Holt) exponential smoothing after every period, updating every
+        SKU row in lockstep. Entry 0 is the starting state: the first observation and the first
+        difference unless given. alpha, beta and the initial values are scalars or one value per
+        SKU row. Returns (levels, trends), each shaped like the data.
+        """
+        values = self.values
+        if values.shape[-1] < 2:
+            raise ValueError("Holt's method needs at least two periods of data.")
+        alpha, beta = self._smoothing_parameters(alpha, beta)
+        levels = np.empty(values.shape)
+        trends = np.empty(values.shape)
+        levels[..., 0] = values[..., 0] if initial_level is None else self._smoothing_parameters(initial_level)[0]
+        trends[..., 0] = (values[..., 1] - values[..., 0] if initial_trend is None
+                          else self._smoothing_parameters(initial_trend)[0])
+        for period in range(1, values.shape[-1]):
+            level, trend = levels[..., period - 1], trends[..., period - 1]
+            levels[..., period] = alpha * values[..., period] + (1 - alpha) * (level + trend)
+            trends[..., period] = beta * (levels[..., period] - level) + (1 - beta) * trend
+        return levels, trends
+
+    def holt_series(self, alpha, beta, initial_level=None, initial_trend=None, horizon=1):
+        """
+        Double (Holt) exponential smoothing with a linear trend, run from the second period on
+        the state described in holt_states.
+
+        Returns (fitted, forecast): fitted[..., t] is the one-step forecast made for period t (NaN
+        for the first period) and forecast[..., h - 1] the forecast h periods past the history.
+        """
+        levels, trends = self.holt_states(alpha, beta, initial_level, initial_trend)
+        fitted = np.full(self.values.shape, np.nan)
+        fitted[..., 1:] = levels[..., :-1] + trends[..., :-1]
+        steps = np.arange(1, horizon + 1)
+        return fitted, levels[..., -1:] + trends[..., -1:] * steps
+
+    def holt_winters_series(self, alpha, beta, gamma, season_length, seasonal="additive", horizon=1):
+        """
+        Triple (Holt-Winters) exponential smoothing with additive or multiplicative seasonality.
+        The first two seasons set the starting state: the level is the mean of the first season,
+        the trend the difference between the two season means divided by season_length, and the
+        seasonal indices the first season's deviations from (additive) or ratios to
+        (multiplicative) that mean. The recursion then runs from the second season, updating
+        every SKU row in lockstep.
+
+        Returns (fitted, forecast) as holt_series does; fitted is NaN for the first season.
+        """
+        if seasonal not in ("additive", "multiplicative"):
+            raise ValueError("seasonal must be 'additive' or 'multiplicative'")
+        values = self.values
+        periods = values.shape[-1]
+        m = int(season_length)
+        if m < 1 or periods < 2 * m:
+            raise ValueError("Holt-Winters needs at least two full seasons of data.")
+        multiplicative = seasonal == "multiplicative"
+        alpha, beta, gamma = self._smoothing_parameters(alpha, beta, gamma)
+
+        # A zero period would give a zero seasonal index, and later divisions by it
+        if multiplicative and np.any(values <= 0):
+            raise ValueError("Multiplicative seasonality needs positive demand in every period.")
+        first_season = values[..., :m].mean(axis=-1)
+        level = first_season
+        trend = (values[..., m:2 * m].mean(axis=-1) - first_season) / m
+        # Ring buffer of seasonal indices: slot t % m holds the latest index for that season position
+        indices = values[..., :m] / level[..., None] if multiplicative else values[..., :m] - level[..., None]
+
+        fitted = np.full(values.shape, np.nan)
+        for period in range(m, periods):
+            slot = period % m
+            demand = values[..., period]
+            season = indices[..., slot]
+            if multiplicative:
+                fitted[..., period] = (level + trend) * season
+                new_level = alpha * demand / season + (1 - alpha) * (level + trend)
+                indices[..., slot] = gamma * demand / new_level + (1 - gamma) * season
+            else:
+                fitted[..., period] = level + trend + season
+                new_level = alpha * (demand - season) + (1 - alpha) * (level + trend)
+                indices[..., slot] = gamma * (demand - new_level) + (1 - gamma) * season
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            level = new_level
+
+        steps = np.arange(1, horizon + 1)
+        season = indices[..., (periods + steps - 1) % m]
+        baseline = level[..., None] + trend[..., None] * steps
+        forecast = baseline * season if multiplicative else baseline + season
+        return fitted, forecast